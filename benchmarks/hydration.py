@@ -0,0 +1,72 @@
+"""
+Micro-benchmark: turning result rows into model instances.
+
+Compares the precompiled `Model._from_db_row()` loader with the previous
+`Model(**row)` + bookkeeping path. No database is needed.
+
+Run from the project's root directory:
+    python -m benchmarks.hydration
+"""
+import timeit
+
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField, BooleanField, ForeignKey
+
+
+class BenchAuthor(Model):
+    __tablename__ = 'bench_authors'
+    id = IntegerField(primary_key=True)
+    name = TextField()
+
+
+class BenchPost(Model):
+    __tablename__ = 'bench_posts'
+    id = IntegerField(primary_key=True)
+    title = TextField()
+    body = TextField()
+    slug = TextField()
+    views = IntegerField()
+    published = BooleanField()
+    author = ForeignKey(to=BenchAuthor)
+
+
+def make_rows(count):
+    return [
+        {'id': i, 'title': f'Title {i}', 'body': 'x' * 200, 'slug': f'title-{i}',
+         'views': i * 3, 'published': bool(i % 2), 'author_id': i % 50}
+        for i in range(count)
+    ]
+
+
+def hydrate_with_init(rows):
+    results = []
+    for row in rows:
+        instance = BenchPost(**row)
+        instance._mark_persisted()
+        results.append(instance)
+    return results
+
+
+def hydrate_with_loader(rows):
+    load_row = BenchPost._load_row
+    return [load_row(row) for row in rows]
+
+
+def main():
+    count = 100_000
+    rows = make_rows(count)
+
+    # Each run needs fresh rows, because the loader keeps them as snapshots.
+    old = min(timeit.repeat(lambda: hydrate_with_init([dict(r) for r in rows]), number=1, repeat=3))
+    new = min(timeit.repeat(lambda: hydrate_with_loader([dict(r) for r in rows]), number=1, repeat=3))
+    copy_only = min(timeit.repeat(lambda: [dict(r) for r in rows], number=1, repeat=3))
+
+    old -= copy_only
+    new -= copy_only
+    print(f"Hydrating {count:,} rows of {len(rows[0])} columns:")
+    print(f"  Model(**row) + _mark_persisted(): {old * 1000:8.1f} ms")
+    print(f"  Model._from_db_row():             {new * 1000:8.1f} ms  ({old / new:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
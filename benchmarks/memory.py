@@ -0,0 +1,82 @@
+"""
+Micro-benchmark: memory held by loaded model instances.
+
+Compares a regular model (one `__dict__` per instance, the row dict kept as
+its snapshot) with the same model declared `__compact__ = True` (slots and a
+tuple snapshot). No database is needed.
+
+Run from the project's root directory:
+    python -m benchmarks.memory
+"""
+import gc
+import timeit
+import tracemalloc
+
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField, BooleanField
+
+
+class DictPost(Model):
+    __tablename__ = 'bench_dict_posts'
+    id = IntegerField(primary_key=True)
+    title = TextField()
+    slug = TextField()
+    views = IntegerField()
+    published = BooleanField()
+
+
+class CompactPost(Model):
+    __tablename__ = 'bench_compact_posts'
+    __compact__ = True
+    id = IntegerField(primary_key=True)
+    title = TextField()
+    slug = TextField()
+    views = IntegerField()
+    published = BooleanField()
+
+
+def make_rows(count):
+    # Values are shared between both runs, so only the per-instance overhead is measured.
+    titles = [f'Title {i}' for i in range(count)]
+    return [
+        {'id': i, 'title': titles[i], 'slug': titles[i], 'views': i, 'published': True}
+        for i in range(count)
+    ]
+
+
+def measure(model_class, rows):
+    """Returns the bytes still allocated after hydrating copies of `rows`."""
+    copies = [dict(r) for r in rows]
+    gc.collect()
+    tracemalloc.start()
+    instances = [model_class._load_row(row) for row in copies]
+    del copies
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size
+
+
+def main():
+    count = 100_000
+    rows = make_rows(count)
+
+    dict_bytes = measure(DictPost, rows)
+    compact_bytes = measure(CompactPost, rows)
+    print(f"Memory held by {count:,} loaded instances of {len(rows[0])} columns:")
+    print(f"  __dict__ model:  {dict_bytes / count:6.0f} bytes/instance")
+    print(f"  __slots__ model: {compact_bytes / count:6.0f} bytes/instance  "
+          f"({dict_bytes / compact_bytes:.1f}x smaller)")
+
+    obj = DictPost._load_row(dict(rows[0]))
+    compact = CompactPost._load_row(dict(rows[0]))
+    read_dict = min(timeit.repeat(lambda: obj.title, number=1_000_000, repeat=3))
+    read_slots = min(timeit.repeat(lambda: compact.title, number=1_000_000, repeat=3))
+    print("Reading one attribute 1,000,000 times:")
+    print(f"  __dict__ model:  {read_dict * 1000:6.1f} ms")
+    print(f"  __slots__ model: {read_slots * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
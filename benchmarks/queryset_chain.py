@@ -0,0 +1,63 @@
+"""
+Micro-benchmark: the cost of building chained QuerySets.
+
+Compares the current structural-sharing clones with the previous
+`copy.deepcopy()`-based cloning. No database is needed.
+
+Run from the project's root directory:
+    python -m benchmarks.queryset_chain
+"""
+import copy
+import timeit
+
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField
+
+
+class BenchArticle(Model):
+    __tablename__ = 'bench_articles'
+    id = IntegerField(primary_key=True)
+    title = TextField()
+    body = TextField()
+
+
+class DeepcopyQuerySet:
+    """The old cloning strategy, kept here only as a baseline."""
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self._filters = {}
+        self._ordering = []
+
+    def filter(self, **kwargs):
+        new_queryset = copy.deepcopy(self)
+        new_queryset._filters.update(kwargs)
+        return new_queryset
+
+    def order_by(self, *args):
+        new_queryset = copy.deepcopy(self)
+        new_queryset._ordering.extend(args)
+        return new_queryset
+
+
+def build_chain(queryset, depth, value):
+    for i in range(depth):
+        queryset = queryset.filter(**{f'field_{i}': value}).order_by('-id')
+    return queryset
+
+
+def main():
+    # A large filter value, like a list of ids or a byte string.
+    big_value = list(range(1000))
+    number = 200
+
+    print(f"{'depth':>6} {'deepcopy (us)':>15} {'shared (us)':>13} {'speedup':>9}")
+    for depth in (1, 5, 10, 20):
+        old = timeit.timeit(lambda: build_chain(DeepcopyQuerySet(BenchArticle), depth, big_value), number=number)
+        new = timeit.timeit(lambda: build_chain(BenchArticle.objects, depth, big_value), number=number)
+        old_us = old / number * 1e6
+        new_us = new / number * 1e6
+        print(f"{depth:>6} {old_us:>15.1f} {new_us:>13.1f} {old_us / new_us:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
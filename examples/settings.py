@@ -6,7 +6,14 @@ DATABASES = {
         "password": "mypassword",
         "database": "mydb",
         "host": "localhost",
-        "port": 5432
+        "port": 5432,
+        # Optional connection pool settings.
+        "pool": {
+            "min_size": 1,
+            "max_size": 10,
+            "acquire_timeout": 30.0,
+            "max_idle_time": 300.0,
+        }
     }
 }
 
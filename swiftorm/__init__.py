@@ -1,13 +1,15 @@
 import importlib
 from .core.models import _model_registry, Model
 from . import db # Import the new state module
+from .core.session import session
+from .core.router import Router
 
 
 def setup(settings_module_path: str):
     global _engine
     
     settings = importlib.import_module(settings_module_path)
-    db_config = settings.DATABASES['default']
+    databases = settings.DATABASES
     
     # Load models from all installed apps.
     if hasattr(settings, 'INSTALLED_APPS'):
@@ -18,27 +20,77 @@ def setup(settings_module_path: str):
             except ImportError:
                 print(f"Warning: Could not import models for app '{app_name}'.")
 
+    # One engine per configured database; 'default' is the primary.
+    db.engines = {name: _create_engine(db_config) for name, db_config in databases.items()}
+    for name, engine in db.engines.items():
+        engine.alias = name
+    db.engine = db.engines['default']
+    print(db.engine)
+
+    # Reads go to the replicas listed in DATABASE_ROUTER, writes to the primary.
+    router_config = dict(getattr(settings, 'DATABASE_ROUTER', None) or {})
+    replica_names = router_config.pop('replicas', [])
+    for name in replica_names:
+        if name not in db.engines or name == 'default':
+            raise ValueError(f"DATABASE_ROUTER replica '{name}' must name a database other than 'default'.")
+    if replica_names:
+        replicas = [db.engines[name] for name in replica_names]
+        db.router = Router(db.engine, replicas, **router_config)
+        db.engine.on_write = db.router.record_write
+        # Replicas share the primary's result cache, so writes invalidate it.
+        # Entries are keyed per database, and what a replica reads while it
+        # may still lag behind a write is not cached at all.
+        for replica in replicas:
+            replica.result_cache = db.engine.result_cache
+            replica.replica_lag = db.router.sticky_seconds
+        print(f"Routing reads to {len(replicas)} replica(s).")
+    else:
+        db.router = None
+
+
+def _create_engine(db_config):
     engine_path = db_config['engine']
 
     module_path, class_name = engine_path.rsplit('.', 1)
     engine_module = importlib.import_module(module_path)
     engine_class = getattr(engine_module, class_name)
 
-    # Create the engine and store it in our central `db` module
-    db.engine = engine_class(db_config)
+    engine = engine_class(db_config)
     print(f"Engine '{class_name}' loaded.")
-    print(db.engine)
+    return engine
 
 
 async def connect():
-    """Establishes the global database connection."""
+    """Establishes the connections of every configured database."""
     if not db.engine: raise Exception("Engine not set up.")
-    await db.engine.connect()
+    for engine in db.engines.values() or [db.engine]:
+        await engine.connect()
 
 
 async def disconnect():
-    """Closes the global database connection."""
-    if db.engine: await db.engine.disconnect()
+    """Closes the connections of every configured database."""
+    for engine in db.engines.values() or ([db.engine] if db.engine else []):
+        await engine.disconnect()
+
+
+def atomic():
+    """
+    Runs a block in a database transaction, with savepoints when nested:
+        async with swiftorm.atomic():
+            ...
+    """
+    if not db.engine: raise Exception("Engine not set up.")
+    return db.engine.atomic()
+
+
+def pipeline():
+    """
+    Sends the queries that run concurrently inside a block as one batch:
+        async with swiftorm.pipeline():
+            posts = await asyncio.gather(*(Post.objects.get(id=i) for i in ids))
+    """
+    if not db.engine: raise Exception("Engine not set up.")
+    return db.engine.pipeline()
 
 
 async def create_all_tables():
@@ -24,6 +24,21 @@ class BaseEngine(ABC):
         """Creates a database table based on a model class."""
         raise NotImplementedError
     
+    @abstractmethod
+    def atomic(self):
+        """Returns an async context manager running its block in a transaction."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def execute_many(self, statements, return_exceptions=False):
+        """Runs independent statements, in as few round trips as possible, and returns their results in order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def pipeline(self):
+        """Returns an async context manager batching the statements run concurrently inside it."""
+        raise NotImplementedError
+
      # --- ABSTRACT METHODS FOR CRUD ---
     @abstractmethod
     async def insert(self, model_instance):
@@ -31,10 +46,25 @@ class BaseEngine(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def update(self, model_instance):
+    async def bulk_insert(self, model_class, instances, batch_size=None):
+        """Inserts many records into the database in as few statements as possible."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def copy_records(self, model_class, records, format='text', include_pk=False):
+        """Streams a large number of records into the database's bulk-load path."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update(self, model_instance, columns=None):
         """Updates an existing record in the database."""
         raise NotImplementedError
         
+    @abstractmethod
+    async def bulk_update(self, model_class, instances, fields, batch_size=None):
+        """Updates the given fields of many records and returns the affected row count."""
+        raise NotImplementedError
+
     @abstractmethod
     async def delete(self, model_instance):
         """Deletes a record from the database."""
@@ -44,3 +74,33 @@ class BaseEngine(ABC):
     async def select(self, model_class, **kwargs):
         """Selects records from the database."""
         raise NotImplementedError
+
+    @abstractmethod
+    async def update_where(self, model_class, filters, updates, returning=None):
+        """Updates all records matching the filters."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_where(self, model_class, filters, returning=None):
+        """Deletes all records matching the filters."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count(self, model_class, **kwargs):
+        """Counts the records matching the filters."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists(self, model_class, **kwargs):
+        """Tells whether any record matches the filters."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def select_in(self, model_class, column, values):
+        """Selects the records whose `column` matches any of `values`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def iterate(self, model_class, **kwargs):
+        """Streams selected records from the database in chunks (an async generator)."""
+        raise NotImplementedError
@@ -0,0 +1,210 @@
+import sys
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A small bounded mapping that evicts the least recently used entry
+    once `maxsize` is exceeded, and counts hits, misses and evictions.
+    """
+    def __init__(self, maxsize=128):
+        if maxsize < 0:
+            raise ValueError("maxsize must be zero or a positive integer.")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def keys(self):
+        """Returns the cached keys, least recently used first."""
+        return list(self._data)
+
+    def get(self, key, default=None):
+        """Returns the cached value (marking it as recently used) or `default`."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores a value and evicts the oldest entries beyond `maxsize`."""
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self.pop_oldest()
+
+    def pop(self, key, default=None):
+        """Removes an entry without counting it as an eviction."""
+        return self._data.pop(key, default)
+
+    def pop_oldest(self):
+        """Evicts and returns the least recently used (key, value) pair."""
+        item = self._data.popitem(last=False)
+        self.evictions += 1
+        return item
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        """Returns the current size and the lifetime counters."""
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def _freeze(value):
+    """Makes query parameters hashable (array parameters arrive as lists)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def estimate_size(rows):
+    """A rough size in bytes of a list of result rows (the containers and their values)."""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class ResultCache:
+    """
+    A cache of query results, bounded by the (estimated) bytes it holds and
+    evicting the least recently used results first.
+
+    Each table has a version that every write bumps. Keys include the versions
+    of all tables a query reads, so a result computed before a write can never
+    be served after it, even if the query was still running during the write.
+    The write also drops the table's entries right away to free their memory.
+    """
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be zero or a positive integer.")
+        self.max_bytes = max_bytes
+        # key -> (rows, size, expires_at)
+        self._data = OrderedDict()
+        self._versions = {}
+        # table -> time.monotonic() of its last write.
+        self._written_at = {}
+        # table -> keys of the entries that read it.
+        self._keys_by_table = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def key(self, tables, sql, values, source=None):
+        """
+        Builds the cache key of a query reading `tables`, at their current
+        versions. `source` names the database that answers it (e.g. a replica),
+        so engines sharing the cache never serve each other's results.
+        """
+        versions = tuple((table, self._versions.get(table, 0)) for table in tables)
+        return (versions, source, sql, _freeze(values))
+
+    def get(self, key):
+        """Returns a fresh copy of the cached rows, or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        rows, _, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        # Callers own (and may modify) the rows they get back.
+        return [dict(row) for row in rows]
+
+    def put(self, key, rows, ttl, min_age=0.0):
+        """
+        Stores a copy of `rows` for `ttl` seconds, evicting old entries beyond
+        `max_bytes`. With `min_age`, results read less than that many seconds
+        after a write to one of their tables are not stored: a lagging replica
+        may not have applied that write yet.
+        """
+        if min_age:
+            now = time.monotonic()
+            for table, _ in key[0]:
+                written_at = self._written_at.get(table)
+                if written_at is not None and now - written_at < min_age:
+                    return
+        rows = [dict(row) for row in rows]
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (rows, size, time.monotonic() + ttl)
+        self.bytes += size
+        for table, _ in key[0]:
+            self._keys_by_table.setdefault(table, set()).add(key)
+
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def invalidate(self, table):
+        """Marks every cached result that read `table` as stale, and frees it."""
+        self._versions[table] = self._versions.get(table, 0) + 1
+        self._written_at[table] = time.monotonic()
+        self.invalidations += 1
+        for key in self._keys_by_table.pop(table, ()):
+            if key in self._data:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+        for table, _ in key[0]:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def clear(self):
+        self._data.clear()
+        self._keys_by_table.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Returns the current size and the lifetime counters."""
+        return {
+            'size': len(self._data),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
@@ -0,0 +1,142 @@
+"""
+Encoders for PostgreSQL's `COPY ... FROM STDIN` protocol.
+
+Rows are encoded incrementally into byte chunks, so a load of any size only
+ever holds one chunk in memory.
+"""
+import struct
+from collections.abc import Mapping
+
+from ..core.fields import IntegerField, BooleanField, ForeignKey
+from ..core import exceptions
+
+
+# Target size of each CopyData message payload.
+CHUNK_SIZE = 64 * 1024
+
+# 11-byte signature, then a 32-bit flags field and a 32-bit header extension length.
+BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+BINARY_TRAILER = struct.pack('!h', -1)
+
+# Characters that must be backslash-escaped in the text format.
+_TEXT_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+})
+
+
+def copy_columns(model_class, include_pk=False):
+    """
+    Returns the (column_name, field) pairs loaded by COPY, in table order.
+    A SERIAL primary key is left to the database unless `include_pk` is True.
+    """
+    meta = model_class._meta
+    names = meta.non_pk_columns if meta.auto_pk and not include_pk else meta.columns
+    return [(col_name, meta.column_fields[col_name]) for col_name in names]
+
+
+def copy_statement(table_name, columns, format='text'):
+    """Builds the `COPY ... FROM STDIN` statement for the given columns."""
+    columns_sql = ", ".join(f'"{col_name}"' for col_name, _ in columns)
+    if format == 'binary':
+        return f'COPY "{table_name}" ({columns_sql}) FROM STDIN WITH (FORMAT binary);'
+    return f'COPY "{table_name}" ({columns_sql}) FROM STDIN;'
+
+
+async def iter_rows(model_class, records, columns, validate=True):
+    """
+    Turns model instances or mappings (sync or async iterable) into value tuples.
+    Mappings are checked against the model's columns, like `Model.__init__` does.
+    """
+    allowed = {col_name for col_name, _ in columns}
+
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            yield _record_values(model_class, record, columns, allowed, validate)
+    else:
+        for record in records:
+            yield _record_values(model_class, record, columns, allowed, validate)
+
+
+def _record_values(model_class, record, columns, allowed, validate):
+    if isinstance(record, model_class):
+        values = tuple(getattr(record, col_name, None) for col_name, _ in columns)
+    elif isinstance(record, Mapping):
+        for key in record:
+            if key not in allowed:
+                raise AttributeError(f"'{model_class.__name__}' object has no attribute '{key}'")
+        values = tuple(record.get(col_name, field.default) for col_name, field in columns)
+    else:
+        raise TypeError(f"COPY expects {model_class.__name__} instances or mappings, got {type(record).__name__}.")
+
+    if validate:
+        for (col_name, field), value in zip(columns, values):
+            if value is None:
+                if field.required:
+                    raise exceptions.ValidationError(f"Field '{col_name}' is required and cannot be null.")
+            elif not isinstance(field, ForeignKey):
+                field.validate(value)
+    return values
+
+
+def _text_value(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def _binary_value(value, field):
+    if value is None:
+        return struct.pack('!i', -1)
+    if isinstance(field, BooleanField):
+        data = b'\x01' if value else b'\x00'
+    elif isinstance(field, (IntegerField, ForeignKey)):
+        data = struct.pack('!i', value)
+    else:
+        data = str(value).encode('utf-8')
+    return struct.pack('!i', len(data)) + data
+
+
+class CopyEncoder:
+    """
+    Streams rows as COPY data chunks and counts how many rows were encoded.
+    """
+    def __init__(self, rows, columns, format='text', chunk_size=CHUNK_SIZE):
+        if format not in ('text', 'binary'):
+            raise ValueError("COPY format must be 'text' or 'binary'.")
+        self.rows = rows
+        self.columns = columns
+        self.format = format
+        self.chunk_size = chunk_size
+        self.row_count = 0
+
+    async def chunks(self):
+        buffer = bytearray()
+        if self.format == 'binary':
+            buffer += BINARY_HEADER
+            field_count = struct.pack('!h', len(self.columns))
+            fields = [field for _, field in self.columns]
+
+        async for values in self.rows:
+            if self.format == 'binary':
+                buffer += field_count
+                for value, field in zip(values, fields):
+                    buffer += _binary_value(value, field)
+            else:
+                buffer += ('\t'.join(_text_value(value) for value in values) + '\n').encode('utf-8')
+            self.row_count += 1
+
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if self.format == 'binary':
+            buffer += BINARY_TRAILER
+        if buffer:
+            yield bytes(buffer)
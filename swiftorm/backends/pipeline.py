@@ -0,0 +1,106 @@
+"""
+Pipelining of independent statements.
+
+    async with swiftorm.pipeline():
+        authors = await asyncio.gather(*(Author.objects.get(id=i) for i in ids))
+
+Inside a pipeline, statements issued by tasks that do not hold a connection
+are queued instead of being run one at a time; everything queued during the
+same event-loop step is sent as one batch per engine through
+`engine.execute_many()`, and each result (or error) goes back to the caller
+that issued it.
+"""
+import asyncio
+import contextvars
+
+
+# Hook a driver connection must provide to pipeline statements:
+#   await conn.execute_pipeline([(sql, values), ...]) -> [rows or QueryError, ...]
+# It writes every statement (each followed by its own Sync, so an error only
+# fails that statement) before reading any result: one round trip in total.
+DRIVER_HOOK = 'execute_pipeline'
+
+_current_pipeline = contextvars.ContextVar('swiftorm_pipeline', default=None)
+
+
+def supports_pipelining(conn):
+    """Returns True if the driver connection exposes the pipeline hook."""
+    return callable(getattr(conn, DRIVER_HOOK, None))
+
+
+def current_pipeline():
+    """Returns the active Pipeline, or None outside `pipeline()`."""
+    return _current_pipeline.get()
+
+
+class Pipeline:
+    """Collects the statements of one event-loop step and sends them together."""
+    def __init__(self):
+        self.open = True
+        self.batches = 0
+        self.statements = 0
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()
+
+    def submit(self, engine, sql, values):
+        """Queues a statement for `engine` and returns the future of its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((engine, sql, values, future))
+        if self._flush_handle is None:
+            # Runs after every task that is ready right now had its turn, so
+            # they can all queue their statements first.
+            self._flush_handle = loop.call_soon(self._start_flush)
+        return future
+
+    def _start_flush(self):
+        self._flush_handle = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        batches = {}
+        for engine, sql, values, future in pending:
+            batches.setdefault(engine, []).append((sql, values, future))
+        for engine, batch in batches.items():
+            task = asyncio.ensure_future(self._flush(engine, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, engine, batch):
+        # The flush runs in its own copy of the context: its statements must
+        # go to the database, not back into this pipeline.
+        _current_pipeline.set(None)
+        self.batches += 1
+        self.statements += len(batch)
+        try:
+            results = await engine.execute_many(
+                [(sql, values) for sql, values, _ in batch], return_exceptions=True
+            )
+        except BaseException as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                # The caller was cancelled while the batch was in flight.
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def drain(self):
+        """Sends whatever is still queued and waits for every batch in flight."""
+        while self._pending or self._tasks:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._start_flush()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        return {'batches': self.batches, 'statements': self.statements}
@@ -0,0 +1,248 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from ..core import exceptions
+
+
+class ConnectionPool:
+    """
+    An asynchronous pool of driver connections.
+
+    Each connection is checked out by exactly one task at a time, so concurrent
+    coroutines never interleave on the same socket. A task that already holds a
+    connection gets the same one back when it asks again (per-task checkout).
+    """
+    def __init__(self, db_config, driver_class, min_size=1, max_size=10,
+                 acquire_timeout=30.0, max_idle_time=300.0, reap_interval=60.0, on_connect=None):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+
+        self.db_config = db_config
+        self.driver_class = driver_class
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_idle_time = max_idle_time
+        self.reap_interval = reap_interval
+        # Optional coroutine function called with every newly opened connection.
+        self.on_connect = on_connect
+
+        # Idle connections as (connection, released_at) pairs. Used as a stack so
+        # the most recently used connections are reused first and the others can
+        # age out and be reaped.
+        self._idle = []
+        self._in_use = set()
+        # Maps an asyncio task to [connection, checkout_depth].
+        self._task_connections = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = True
+        self._cond = None
+        self._reaper = None
+
+        # Counters exposed through `stats()`.
+        self._acquired = 0
+        self._created = 0
+        self._reaped = 0
+        self._timeouts = 0
+
+    async def open(self):
+        """Creates the synchronization primitives and the first `min_size` connections."""
+        # Primitives are created here so they bind to the running event loop.
+        self._cond = asyncio.Condition()
+        self._closed = False
+        for _ in range(self.min_size):
+            self._size += 1
+            try:
+                conn = await self._new_connection()
+            except BaseException:
+                self._size -= 1
+                raise
+            self._idle.append((conn, time.monotonic()))
+
+        if self.max_idle_time is not None:
+            self._reaper = asyncio.ensure_future(self._reap_forever())
+
+    async def close(self):
+        """Closes every idle connection and stops handing out new ones."""
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            await self._close_connection(conn)
+
+        # Connections still checked out are closed when they are released.
+        if self._cond is not None:
+            async with self._cond:
+                self._cond.notify_all()
+
+    async def _new_connection(self):
+        conn = self.driver_class(self.db_config)
+        await conn.connect()
+        if self.on_connect is not None:
+            try:
+                await self.on_connect(conn)
+            except BaseException:
+                await conn.close()
+                raise
+        self._created += 1
+        return conn
+
+    async def _close_connection(self, conn):
+        self._size -= 1
+        try:
+            await conn.close()
+        except Exception:
+            # The connection is being thrown away; a failing close changes nothing.
+            pass
+
+    async def acquire(self):
+        """
+        Checks out a connection, waiting at most `acquire_timeout` seconds.
+        Raises PoolTimeoutError if no connection becomes available in time.
+        """
+        if self._closed:
+            raise exceptions.ORMError("Connection pool is closed.")
+        try:
+            conn = await asyncio.wait_for(self._acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise exceptions.PoolTimeoutError(
+                f"Could not acquire a connection within {self.acquire_timeout} seconds "
+                f"(max_size={self.max_size})."
+            )
+        self._acquired += 1
+        return conn
+
+    async def _acquire(self):
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise exceptions.ORMError("Connection pool is closed.")
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    self._in_use.add(conn)
+                    return conn
+                if self._size < self.max_size:
+                    # Reserve the slot now; the connection is opened outside the lock.
+                    self._size += 1
+                    break
+                self._waiting += 1
+                try:
+                    await self._cond.wait()
+                finally:
+                    self._waiting -= 1
+
+        try:
+            conn = await self._new_connection()
+        except BaseException:
+            async with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._in_use.add(conn)
+        return conn
+
+    async def release(self, conn, discard=False):
+        """
+        Returns a connection to the pool. With `discard=True` (or once the pool is
+        closed) the connection is closed instead of being reused.
+        """
+        if conn not in self._in_use:
+            raise exceptions.ORMError("Connection does not belong to this pool or was already released.")
+        self._in_use.discard(conn)
+
+        if discard or self._closed:
+            await self._close_connection(conn)
+        else:
+            self._idle.append((conn, time.monotonic()))
+
+        async with self._cond:
+            self._cond.notify()
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Checks out a connection for the current task. Nested uses inside the same
+        task share a single connection; it goes back to the pool when the
+        outermost block exits. Child tasks never inherit their parent's connection.
+        """
+        task = asyncio.current_task()
+        entry = self._task_connections.get(task)
+        if entry is not None:
+            entry[1] += 1
+            try:
+                yield entry[0]
+            finally:
+                entry[1] -= 1
+            return
+
+        conn = await self.acquire()
+        entry = self._task_connections[task] = [conn, 1]
+        discard = False
+        try:
+            yield conn
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            # The socket may be left mid-message; never hand it to another task.
+            discard = True
+            raise
+        finally:
+            del self._task_connections[task]
+            await self.release(conn, discard=discard)
+
+    def current_connection(self):
+        """Returns the connection the current task has checked out, or None."""
+        entry = self._task_connections.get(asyncio.current_task())
+        return entry[0] if entry is not None else None
+
+    async def execute(self, sql, values):
+        """Runs one statement on a checked-out connection (same interface as the driver)."""
+        async with self.connection() as conn:
+            return await conn.execute(sql, values)
+
+    async def _reap_forever(self):
+        while not self._closed:
+            await asyncio.sleep(self.reap_interval)
+            await self.reap_idle()
+
+    async def reap_idle(self):
+        """Closes connections that have been idle longer than `max_idle_time`, keeping `min_size`."""
+        if self.max_idle_time is None:
+            return
+        now = time.monotonic()
+        keep = []
+        expired = []
+        # Oldest connections sit at the bottom of the stack.
+        for conn, released_at in self._idle:
+            removable = self._size - len(expired) > self.min_size
+            if removable and now - released_at >= self.max_idle_time:
+                expired.append(conn)
+            else:
+                keep.append((conn, released_at))
+        self._idle = keep
+        for conn in expired:
+            await self._close_connection(conn)
+            self._reaped += 1
+
+    def stats(self):
+        """Returns a snapshot of the pool's state and lifetime counters."""
+        return {
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'size': self._size,
+            'idle': len(self._idle),
+            'in_use': len(self._in_use),
+            'waiting': self._waiting,
+            'acquired': self._acquired,
+            'created': self._created,
+            'reaped': self._reaped,
+            'timeouts': self._timeouts,
+        }
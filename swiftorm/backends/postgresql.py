@@ -1,3 +1,7 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+
 from async_driver.driver import Driver as PGDriver
 from async_driver.exceptions import QueryError
 
@@ -5,7 +9,13 @@ from ..core.fields import IntegerField, TextField, BooleanField, ForeignKey
 from .base import BaseEngine
 from ..core.models import Model
 from .base import BaseEngine
+from .pool import ConnectionPool
+from .cache import LRUCache, ResultCache
+from .prepared import PreparedStatementCache, supports_prepared_statements
+from .pipeline import Pipeline, current_pipeline, supports_pipelining, _current_pipeline
+from . import pgcopy
 from ..core import exceptions
+from ..core.lookups import split_lookup, escape_like
 
 # A corrected and more robust mapping from our Field classes to PostgreSQL type strings.
 FIELD_TYPE_MAP = {
@@ -14,6 +24,28 @@ FIELD_TYPE_MAP = {
     BooleanField: 'BOOLEAN',
 }
 
+# The Bind message stores the parameter count in a 16-bit integer,
+# so a single statement can never carry more than this many values.
+MAX_QUERY_PARAMETERS = 65535
+
+# SQL for each filter lookup; `{}` is replaced by the parameter placeholder.
+# `isnull` becomes IS NULL / IS NOT NULL, so it needs no parameter at all.
+LOOKUP_SQL = {
+    'exact': '= {}',
+    'in': '= ANY({})',
+    'gt': '> {}',
+    'gte': '>= {}',
+    'lt': '< {}',
+    'lte': '<= {}',
+    'startswith': 'LIKE {}',
+    'isnull': 'IS NULL',
+    'isnotnull': 'IS NOT NULL',
+}
+
+# Keys of DATABASES['default'] that configure the engine itself and are
+# therefore not passed on to the driver connections.
+ENGINE_OPTIONS = ('pool', 'statement_cache_size', 'prepared_statements', 'result_cache')
+
 
 class PostgresEngine(BaseEngine):
     """
@@ -22,51 +54,339 @@ class PostgresEngine(BaseEngine):
     """
     def __init__(self, db_config):
         super().__init__(db_config)
-        # It uses the low-level driver we built in the first project.
-        self.driver = PGDriver(db_config)
+        # Pool settings live under an optional 'pool' key, e.g.
+        # 'pool': {'min_size': 1, 'max_size': 10, 'acquire_timeout': 30.0, 'max_idle_time': 300.0}
+        pool_options = db_config.get('pool', {})
+        driver_config = {key: value for key, value in db_config.items() if key not in ENGINE_OPTIONS}
+
+        # Every connection in the pool is an instance of the low-level driver
+        # we built in the first project.
+        self.pool = ConnectionPool(driver_config, PGDriver, on_connect=self._on_connect, **pool_options)
+
+        # Compiled SQL is cached per model, keyed on the statement's "shape"
+        # (kind of statement, column set, filter keys, ordering, ...).
+        self.statement_cache_size = db_config.get('statement_cache_size', 128)
+        self._statement_caches = {}
+        # (model, select_related() names) -> (joins, tables read). Only a few
+        # such combinations exist per model, so this is a plain dict.
+        self._join_plans = {}
+
+        # Named prepared statements are cached per connection, e.g.
+        # 'prepared_statements': {'cache_size': 100, 'warm': ['SELECT ...']}
+        # A cache_size of 0 disables them.
+        prepared_options = db_config.get('prepared_statements', {})
+        self.prepared_cache_size = prepared_options.get('cache_size', 100)
+        self.prepared_warm = list(prepared_options.get('warm', []))
+        self._prepared = weakref.WeakKeyDictionary()
+
+        # Results of `QuerySet.cached()` queries, bounded by size in bytes, e.g.
+        # 'result_cache': {'max_bytes': 32 * 1024 * 1024}
+        self.result_cache = ResultCache(**db_config.get('result_cache', {}))
+
+        # Set by `swiftorm.setup()`: the name of this database in DATABASES,
+        # and for read replicas, how long after a write their results may
+        # still be stale (such results are not cached).
+        self.alias = 'default'
+        self.replica_lag = 0.0
+
+        # Optional callable run with the model class after every write (used by
+        # the read/write router to keep the writing context on the primary).
+        self.on_write = None
+
+        # Open transactions, per connection: [savepoint depth, models written].
+        self._transactions = weakref.WeakKeyDictionary()
+
+        # Used to give every server-side cursor a unique name.
+        self._cursor_counter = 0
+
+    @property
+    def driver(self):
+        """
+        Kept for backwards compatibility: the pool exposes the same
+        `execute(sql, values)` interface as a single driver connection.
+        """
+        return self.pool
 
     async def connect(self):
-        """Connects to the PostgreSQL database using our custom driver."""
+        """Opens the connection pool using our custom driver."""
         print("Connecting to PostgreSQL...")
-        await self.driver.connect()
+        await self.pool.open()
         print("Connection successful.")
 
     async def disconnect(self):
-        """Disconnects from the PostgreSQL database."""
+        """Closes every connection in the pool."""
         print("Disconnecting from PostgreSQL...")
-        await self.driver.close()
+        await self.pool.close()
         print("Disconnection successful.")
 
+    async def _execute(self, sql, values):
+        """
+        Runs a statement on a connection checked out from the pool, or queues
+        it in the active pipeline when the current task holds no connection.
+        """
+        pipeline = current_pipeline()
+        if pipeline is not None and pipeline.open and self.pool.current_connection() is None:
+            return await pipeline.submit(self, sql, values)
+        async with self.pool.connection() as conn:
+            return await self._run(conn, sql, values)
+
+    async def _run(self, conn, sql, values):
+        """
+        Runs a statement on a specific connection, through its named
+        prepared statement when the driver supports them.
+        """
+        prepared = self._prepared_statements(conn)
+        if prepared is None:
+            return await conn.execute(sql, values)
+        return await prepared.execute(sql, values)
+
+    async def execute_many(self, statements, return_exceptions=False):
+        """
+        Runs independent `(sql, values)` statements and returns their results
+        in order. Each statement succeeds or fails on its own: with
+        `return_exceptions=True` a failure is returned in its slot, otherwise
+        the first one is raised once every statement has finished.
+
+        A driver with the `execute_pipeline` hook gets all of them in a single
+        round trip. Otherwise they run concurrently on separate pooled
+        connections, or one after another on the connection the current task
+        already holds (e.g. inside `atomic()`, where a failure aborts the
+        transaction as usual).
+        """
+        statements = list(statements)
+        if not statements:
+            return []
+
+        results = None
+        conn = self.pool.current_connection()
+        if conn is not None:
+            results = await self._run_many(conn, statements)
+        else:
+            async with self.pool.connection() as conn:
+                if supports_pipelining(conn):
+                    results = await self._run_many(conn, statements)
+            if results is None:
+                results = await asyncio.gather(
+                    *(self._run_pooled(sql, values) for sql, values in statements),
+                    return_exceptions=True,
+                )
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+
+    async def _run_many(self, conn, statements):
+        """Runs statements on one connection, pipelined when the driver supports it."""
+        if supports_pipelining(conn):
+            return await conn.execute_pipeline(statements)
+        results = []
+        for sql, values in statements:
+            try:
+                results.append(await self._run(conn, sql, values))
+            except QueryError as e:
+                results.append(e)
+        return results
+
+    async def _run_pooled(self, sql, values):
+        # Never queued again: this is how a pipeline batch reaches the database.
+        async with self.pool.connection() as conn:
+            return await self._run(conn, sql, values)
+
+    @asynccontextmanager
+    async def pipeline(self):
+        """
+        Batches the statements that run concurrently inside the block (e.g.
+        under `asyncio.gather()`) into as few round trips as the driver allows.
+        Covers every engine (e.g. read replicas); nested `pipeline()` blocks
+        share the outer one.
+        """
+        active = _current_pipeline.get()
+        if active is not None and active.open:
+            yield active
+            return
+
+        pipeline = Pipeline()
+        token = _current_pipeline.set(pipeline)
+        try:
+            yield pipeline
+        finally:
+            _current_pipeline.reset(token)
+            try:
+                await pipeline.drain()
+            finally:
+                pipeline.open = False
+
+    def _prepared_statements(self, conn):
+        """Returns the prepared-statement cache of a connection, or None if not available."""
+        prepared = self._prepared.get(conn)
+        if prepared is None:
+            if not self.prepared_cache_size or not supports_prepared_statements(conn):
+                return None
+            prepared = self._prepared[conn] = PreparedStatementCache(conn, self.prepared_cache_size)
+        return prepared
+
+    async def _on_connect(self, conn):
+        """Warms the configured statements on every new pooled connection."""
+        prepared = self._prepared_statements(conn)
+        if prepared is None:
+            return
+        for sql in self.prepared_warm:
+            await prepared.prepare(sql)
+
+    def prepared_statement_stats(self):
+        """Returns the prepared-statement counters summed over all live connections."""
+        total = {'connections': 0, 'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+        for prepared in list(self._prepared.values()):
+            total['connections'] += 1
+            for key, value in prepared.stats().items():
+                if key in total:
+                    total[key] += value
+        return total
+
+    def _statement(self, model_class, key, build, *args):
+        """
+        Returns the SQL for a statement shape, building it with `build(*args)`
+        only the first time that shape is seen for this model.
+        """
+        cache = self._statement_caches.get(model_class)
+        if cache is None:
+            cache = self._statement_caches[model_class] = LRUCache(self.statement_cache_size)
+
+        sql = cache.get(key)
+        if sql is None:
+            sql = build(*args)
+            cache.put(key, sql)
+        return sql
+
+    def _current_transaction(self):
+        """Returns the state of the transaction the current task is in, or None."""
+        conn = self.pool.current_connection()
+        return self._transactions.get(conn) if conn is not None else None
+
+    @asynccontextmanager
+    async def atomic(self):
+        """
+        Runs the block in a transaction on one connection, pinned to the
+        current task: every ORM call inside it uses that connection. The
+        outermost block issues BEGIN and COMMIT (ROLLBACK on error); nested
+        blocks use savepoints, so an inner failure only undoes the inner block.
+        Tasks started inside the block do not join the transaction.
+        """
+        async with self.pool.connection() as conn:
+            transaction = self._transactions.get(conn)
+            if transaction is None:
+                transaction = self._transactions[conn] = [0, set()]
+                await conn.execute('BEGIN;', [])
+            else:
+                transaction[0] += 1
+                await conn.execute(f'SAVEPOINT "swiftorm_sp_{transaction[0]}";', [])
+
+            depth = transaction[0]
+            try:
+                yield conn
+            except BaseException:
+                if depth == 0:
+                    del self._transactions[conn]
+                    try:
+                        await conn.execute('ROLLBACK;', [])
+                    finally:
+                        self._invalidate_written(transaction[1])
+                else:
+                    transaction[0] -= 1
+                    await conn.execute(f'ROLLBACK TO SAVEPOINT "swiftorm_sp_{depth}";', [])
+                    await conn.execute(f'RELEASE SAVEPOINT "swiftorm_sp_{depth}";', [])
+                raise
+            else:
+                if depth == 0:
+                    del self._transactions[conn]
+                    try:
+                        await conn.execute('COMMIT;', [])
+                    finally:
+                        self._invalidate_written(transaction[1])
+                else:
+                    transaction[0] -= 1
+                    await conn.execute(f'RELEASE SAVEPOINT "swiftorm_sp_{depth}";', [])
+
+    def _invalidate_written(self, models):
+        # Other connections could have cached the old rows until the
+        # transaction ended, so its writes are invalidated once more.
+        for model_class in models:
+            self._invalidate(model_class)
+
+    def _invalidate(self, model_class):
+        """
+        Drops the cached results of `model_class`'s table after a write, and of
+        every table that references it (ON DELETE CASCADE / SET NULL change them too).
+        """
+        transaction = self._current_transaction()
+        if transaction is not None:
+            transaction[1].add(model_class)
+        if self.on_write is not None:
+            self.on_write(model_class)
+
+        pending = [model_class]
+        seen = set()
+        while pending:
+            model = pending.pop()
+            if model in seen:
+                continue
+            seen.add(model)
+            self.result_cache.invalidate(model.__tablename__)
+            pending.extend(relation.model_class for relation in model._reverse_relations.values())
+
+    @asynccontextmanager
+    async def _writing(self, model_class):
+        """Invalidates `model_class`'s cached results when a multi-statement write ends, even a failed one."""
+        try:
+            yield
+        finally:
+            self._invalidate(model_class)
+
+    def result_cache_stats(self):
+        """Returns the hit/miss/eviction counters and the size of the query result cache."""
+        return self.result_cache.stats()
+
+    def statement_cache_stats(self):
+        """Returns hit/miss/eviction counters of the compiled SQL cache, per table and in total."""
+        per_model = {}
+        total = {'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+        for model_class, cache in self._statement_caches.items():
+            stats = cache.stats()
+            per_model[model_class.__tablename__] = stats
+            for key in total:
+                total[key] += stats[key]
+        return {'total': total, 'models': per_model}
+
     async def create_table(self, model_class: Model):
         """
         Builds and executes a 'CREATE TABLE' SQL statement for a given model,
         now with support for ForeignKey constraints.
         """
-        table_name = model_class.__tablename__
+        meta = model_class._meta
+        table_name = meta.table_name
         
         sql_columns = []
         # We will collect table-level constraints like foreign keys separately.
         table_constraints = []
-        all_fields = {**model_class._fields, **model_class._foreign_keys}
 
-        for name, field in all_fields.items():
+        for name, field in meta.fields.items():
+            # The quoted column name (`"field_name_id"` for foreign keys)
+            col_name = meta.quoted_columns[meta.field_columns[name]]
             
             # LOGIC FOR ForeignKey
             if isinstance(field, ForeignKey):
-                # The actual column name will be `field_name_id`
-                col_name = f'"{name}_id"'
                 # Foreign key columns are typically integers
                 column_type_str = 'INTEGER'
                 
-                related_table = field.related_model.__tablename__
-                
-                # Dynamic ID Field
-                related_field = field.related_model._get_pk_name()
+                related_meta = field.related_model._meta
                 
-                # Build the FOREIGN KEY constraint string
+                # Build the FOREIGN KEY constraint string (with the dynamic ID field)
                 fk_constraint = (
-                    f'CONSTRAINT fk_{table_name}_{name}_to_{related_table} '
-                    f'FOREIGN KEY ({col_name}) REFERENCES "{related_table}" ("{related_field}") '
+                    f'CONSTRAINT fk_{table_name}_{name}_to_{related_meta.table_name} '
+                    f'FOREIGN KEY ({col_name}) REFERENCES {related_meta.quoted_table} '
+                    f'({related_meta.quoted_columns[related_meta.pk_name]}) '
                     f'ON DELETE {field.on_delete.upper()}'
                 )
                 table_constraints.append(fk_constraint)
@@ -106,7 +426,7 @@ class PostgresEngine(BaseEngine):
                     constraints.append('UNIQUE')
                     
                 # Assemble the final column definition string
-                full_column_def = f'"{name}" {column_type_str} {" ".join(constraints)}'
+                full_column_def = f'{col_name} {column_type_str} {" ".join(constraints)}'
                 sql_columns.append(full_column_def.strip())
         
         # Add the table-level constraints at the end
@@ -115,59 +435,50 @@ class PostgresEngine(BaseEngine):
             
         columns_sql = ", ".join(sql_columns)
         
-        create_sql = f'CREATE TABLE IF NOT EXISTS "{table_name}" ({columns_sql});'
+        create_sql = f'CREATE TABLE IF NOT EXISTS {meta.quoted_table} ({columns_sql});'
         
         print(f"Executing: {create_sql}")
         
-        await self.driver.execute(create_sql, [])
+        await self._execute(create_sql, [])
         print(f"Table '{table_name}' created or already exists.")
     
     async def insert(self, model_instance):
         """
         Builds and executes an INSERT statement.
         """
-        table_name = model_instance.__tablename__
+        meta = model_instance._meta
+        table_name = meta.table_name
         
         columns = []
         values = []
-        all_fields = {**model_instance._fields, **model_instance._foreign_keys}
 
         # Dynamically find the primary key name
-        pk_field_name = model_instance._get_pk_name()
+        pk_field_name = meta.pk_name
 
         # This new, smarter loop handles all cases correctly.
-        for name, field in all_fields.items():
-            value = None
-            col_name = name
-            
-            if isinstance(field, ForeignKey):
-                col_name = f"{name}_id"
-                value = getattr(model_instance, col_name, None)
-            else:
-                value = getattr(model_instance, name, None)
+        for col_name in meta.columns:
+            value = getattr(model_instance, col_name, None)
             
             # THE KEY LOGIC: We skip the primary key ONLY if it's an IntegerField
             # (which we assume is SERIAL) AND its value is None.
             # In all other cases (like a TextField PK), we include it.
-            if field.primary_key and isinstance(field, IntegerField) and value is None:
+            if col_name == pk_field_name and meta.auto_pk and value is None:
                 continue
 
-            columns.append(f'"{col_name}"')
+            columns.append(col_name)
             values.append(value)
-       
-        # Build placeholders like $1, $2, $3
-        placeholders = ', '.join([f'${i+1}' for i in range(len(values))])
-                
-        sql = f'INSERT INTO "{table_name}" ({", ".join(columns)}) VALUES ({placeholders})'
 
         # Only use RETURNING if the PK is an auto-generating integer.
-        if pk_field_name and isinstance(model_instance._fields.get(pk_field_name), IntegerField):
-            sql += f' RETURNING "{pk_field_name}";'
-        else:
-            sql += ';'
+        returning = pk_field_name if meta.auto_pk else None
+
+        sql = self._statement(
+            type(model_instance), ('insert', tuple(columns), 1, returning),
+            self._build_insert_sql, table_name, columns, 1, returning
+        )
 
         try:
-            result = await self.driver.execute(sql, values)
+            result = await self._execute(sql, values)
+            self._invalidate(type(model_instance))
             
             # Only try to set the PK if the database returned a result.
             if pk_field_name and result and pk_field_name in result[0]:
@@ -181,46 +492,192 @@ class PostgresEngine(BaseEngine):
                 # Re-raise other query errors
                 raise e
 
-    async def update(self, model_instance):
+    async def bulk_insert(self, model_class, instances, batch_size=None):
+        """
+        Inserts many instances with chunked multi-row INSERT statements, all or
+        nothing. Generated SERIAL primary keys are assigned back onto the instances.
+        """
+        if not instances:
+            return
+
+        meta = model_class._meta
+        pk_field_name = meta.pk_name
+        auto_pk = meta.auto_pk
+
+        # Instances that already carry a PK must send it; the others let SERIAL
+        # generate it. Each group gets its own column list.
+        with_pk = []
+        without_pk = []
+        for instance in instances:
+            if auto_pk and getattr(instance, pk_field_name, None) is None:
+                without_pk.append(instance)
+            else:
+                with_pk.append(instance)
+
+        # All batches run in one transaction (a savepoint inside atomic()), so
+        # a failing batch never leaves the earlier ones committed.
+        try:
+            async with self.atomic(), self._writing(model_class):
+                await self._insert_groups(model_class, ((with_pk, True), (without_pk, False)), batch_size)
+        except BaseException:
+            # The generated keys were rolled back with their rows.
+            for instance in without_pk:
+                setattr(instance, pk_field_name, None)
+            raise
+
+    async def _insert_groups(self, model_class, groups, batch_size):
+        """Runs the INSERT batches of each (instances, include_pk) group."""
+        meta = model_class._meta
+        table_name = meta.table_name
+        pk_field_name = meta.pk_name
+        auto_pk = meta.auto_pk
+
+        for group, include_pk in groups:
+            if not group:
+                continue
+
+            columns = meta.columns if include_pk else meta.non_pk_columns
+
+            returning = pk_field_name if auto_pk else None
+
+            if not columns:
+                # Nothing but a SERIAL PK: every row is all defaults.
+                for instance in group:
+                    sql = f'INSERT INTO "{table_name}" DEFAULT VALUES RETURNING "{pk_field_name}";'
+                    result = await self._execute(sql, [])
+                    setattr(instance, pk_field_name, result[0][pk_field_name])
+                continue
+
+            rows_per_batch = MAX_QUERY_PARAMETERS // len(columns)
+            if batch_size is not None:
+                rows_per_batch = min(rows_per_batch, batch_size)
+
+            for start in range(0, len(group), rows_per_batch):
+                batch = group[start:start + rows_per_batch]
+
+                values = []
+                for instance in batch:
+                    values.extend(getattr(instance, col_name, None) for col_name in columns)
+
+                # Full batches share one shape; only the last batch differs.
+                sql = self._statement(
+                    model_class, ('insert', tuple(columns), len(batch), returning),
+                    self._build_insert_sql, table_name, columns, len(batch), returning
+                )
+
+                try:
+                    result = await self._execute(sql, values)
+                except QueryError as e:
+                    if 'unique constraint' in str(e).lower():
+                        raise exceptions.IntegrityError(f"A record with this value already exists. Details: {e}")
+                    else:
+                        raise e
+
+                # RETURNING yields rows in the same order as the VALUES list.
+                if auto_pk and result:
+                    for instance, row in zip(batch, result):
+                        setattr(instance, pk_field_name, row[pk_field_name])
+
+    async def copy_records(self, model_class, records, format='text', include_pk=False):
+        """
+        Bulk-loads records (model instances or mappings, from a sync or async
+        iterable) through `COPY ... FROM STDIN` and returns the number of rows.
+        Rows are encoded chunk by chunk, so memory stays flat for any input size.
+        """
+        if format not in ('text', 'binary'):
+            raise ValueError("COPY format must be 'text' or 'binary'.")
+
+        table_name = model_class.__tablename__
+        columns = pgcopy.copy_columns(model_class, include_pk=include_pk)
+        rows = pgcopy.iter_rows(model_class, records, columns)
+
+        async with self.pool.connection() as conn, self._writing(model_class):
+            copy_from_stdin = getattr(conn, 'copy_from_stdin', None)
+            try:
+                if copy_from_stdin is None:
+                    # The driver cannot speak the COPY sub-protocol; stream the
+                    # same rows as batched multi-row INSERTs instead, in one
+                    # transaction (or savepoint) so that, like COPY, a failure
+                    # loads nothing.
+                    async with self.atomic():
+                        return await self._insert_rows(model_class, columns, rows)
+
+                encoder = pgcopy.CopyEncoder(rows, columns, format=format)
+                sql = pgcopy.copy_statement(table_name, columns, format=format)
+                await copy_from_stdin(sql, encoder.chunks())
+                return encoder.row_count
+            except QueryError as e:
+                if 'unique constraint' in str(e).lower():
+                    raise exceptions.IntegrityError(f"A record with this value already exists. Details: {e}")
+                else:
+                    raise e
+
+    async def _insert_rows(self, model_class, columns, rows):
+        """Inserts an async stream of value tuples with parameter-limited multi-row INSERTs."""
+        table_name = model_class.__tablename__
+        column_names = [col_name for col_name, _ in columns]
+        rows_per_batch = MAX_QUERY_PARAMETERS // max(len(columns), 1)
+        values = []
+        pending = 0
+        count = 0
+
+        async def flush():
+            sql = self._statement(
+                model_class, ('insert', tuple(column_names), pending, None),
+                self._build_insert_sql, table_name, column_names, pending
+            )
+            await self._execute(sql, values)
+            values.clear()
+
+        async for row in rows:
+            values.extend(row)
+            pending += 1
+            count += 1
+            if pending >= rows_per_batch:
+                await flush()
+                pending = 0
+
+        if pending:
+            await flush()
+        return count
+
+    async def update(self, model_instance, columns=None):
         """
         Builds and executes an UPDATE statement.
+        If `columns` is given, only those columns are written.
         """
-        table_name = model_instance.__tablename__
+        meta = model_instance._meta
+        table_name = meta.table_name
 
-        pk_field_name = model_instance._get_pk_name()
+        pk_field_name = meta.pk_name
         pk_value = getattr(model_instance, pk_field_name)
 
-        update_fields = []
+        update_columns = []
         values = []
-        i = 1
-        
-        # Combine all fields for updating
-        all_fields = {**model_instance._fields, **model_instance._foreign_keys}
-
-        for name, field in all_fields.items():
-            if not field.primary_key:
-                # Handle foreign keys by updating the `_id` column
-                if isinstance(field, ForeignKey):
-                    col_name = f"{name}_id"
-                    update_fields.append(f'"{col_name}" = ${i}')
-                    values.append(getattr(model_instance, col_name))
-                # Handle regular fields
-                else:
-                    col_name = name
-                    update_fields.append(f'"{col_name}" = ${i}')
-                    values.append(getattr(model_instance, col_name))
-                i += 1
 
-        if not update_fields:
+        # Foreign keys are updated through their `_id` column
+        for col_name in meta.non_pk_columns:
+            # Skip columns that were not asked for (e.g. unchanged ones)
+            if columns is not None and col_name not in columns:
+                continue
+
+            update_columns.append(col_name)
+            values.append(getattr(model_instance, col_name))
+
+        if not update_columns:
             return
 
         # Add the primary key value for the WHERE clause
         values.append(pk_value)
         
-        sql = f'UPDATE "{table_name}" SET {", ".join(update_fields)} WHERE "{pk_field_name}" = ${i};'
+        sql = self._statement(
+            type(model_instance), ('update', tuple(update_columns)),
+            self._build_update_sql, table_name, update_columns, pk_field_name
+        )
         
         try:
-            await self.driver.execute(sql, values)
+            await self._execute(sql, values)
+            self._invalidate(type(model_instance))
         except QueryError as e:
             # Check if the database error is about a unique constraint violation
             if 'unique constraint' in str(e).lower():
@@ -229,61 +686,547 @@ class PostgresEngine(BaseEngine):
                 # Re-raise other query errors
                 raise e
 
+    async def bulk_update(self, model_class, instances, fields, batch_size=None):
+        """
+        Updates the given columns of many instances with one
+        `UPDATE ... FROM (VALUES ...)` statement per batch.
+        Returns the number of rows the database actually updated.
+        """
+        if not instances:
+            return 0
+
+        meta = model_class._meta
+        table_name = meta.table_name
+
+        # (column name, field) pairs: the PK first, then the columns to write.
+        columns = [(meta.pk_name, meta.pk_field)]
+        for name in fields:
+            col_name = meta.column_for(name)
+            columns.append((col_name, meta.column_fields[col_name]))
+
+        column_names = tuple(col_name for col_name, _ in columns)
+
+        rows_per_batch = MAX_QUERY_PARAMETERS // len(columns)
+        if batch_size is not None:
+            rows_per_batch = min(rows_per_batch, batch_size)
+
+        affected = 0
+        async with self.pool.connection(), self._writing(model_class):
+            for start in range(0, len(instances), rows_per_batch):
+                batch = instances[start:start + rows_per_batch]
+
+                values = []
+                for instance in batch:
+                    values.extend(getattr(instance, col_name) for col_name in column_names)
+
+                sql = self._statement(
+                    model_class, ('bulk_update', column_names, len(batch)),
+                    self._build_bulk_update_sql, table_name, columns, len(batch)
+                )
+
+                try:
+                    result = await self._execute(sql, values)
+                except QueryError as e:
+                    if 'unique constraint' in str(e).lower():
+                        raise exceptions.IntegrityError(f"A record with this value already exists. Details: {e}")
+                    else:
+                        raise e
+                affected += len(result or [])
+
+        return affected
+
+    @staticmethod
+    def _cast_type(field):
+        """Returns the PostgreSQL type used to cast a parameter for this field."""
+        # Foreign key columns are created as integers (see create_table).
+        if isinstance(field, ForeignKey):
+            return 'INTEGER'
+        return FIELD_TYPE_MAP.get(type(field), 'TEXT')
+
     async def delete(self, model_instance):
         """
         Builds and executes a DELETE statement.
         """
-        table_name = model_instance.__tablename__
-        pk_field_name = model_instance._get_pk_name()
+        meta = model_instance._meta
+        table_name = meta.table_name
+        pk_field_name = meta.pk_name
         pk_value = getattr(model_instance, pk_field_name)
         
-        sql = f'DELETE FROM "{table_name}" WHERE "{pk_field_name}" = $1;'
+        sql = self._statement(
+            type(model_instance), ('delete',),
+            self._build_delete_sql, table_name, pk_field_name
+        )
         
-        await self.driver.execute(sql, [pk_value])
+        await self._execute(sql, [pk_value])
+        self._invalidate(type(model_instance))
+
+    async def update_where(self, model_class, filters, updates, returning=None):
+        """
+        Updates every row matching the filters with one `UPDATE ... WHERE`.
+        `updates` maps column names to new values. Returns the affected row
+        count, or the rows' `returning` columns as a list of dicts.
+        """
+        where, filter_values = self._filter_params(filters)
+        set_columns = tuple(updates)
+        returning = tuple(returning) if returning else None
+
+        sql = self._statement(
+            model_class, ('update_where', set_columns, where, returning),
+            self._build_update_where_sql, model_class.__tablename__, set_columns, where, returning
+        )
 
-    async def select(self, model_class, filters={}, ordering=[], limit=None):
+        try:
+            rows = await self._execute(sql, list(updates.values()) + filter_values)
+            self._invalidate(model_class)
+        except QueryError as e:
+            if 'unique constraint' in str(e).lower():
+                raise exceptions.IntegrityError(f"A record with this value already exists. Details: {e}")
+            else:
+                raise e
+        return rows if returning else rows[0]['count']
+
+    async def delete_where(self, model_class, filters, returning=None):
+        """
+        Deletes every row matching the filters with one `DELETE ... WHERE`.
+        Returns the affected row count, or the deleted rows' `returning`
+        columns as a list of dicts.
+        """
+        where, values = self._filter_params(filters)
+        returning = tuple(returning) if returning else None
+
+        sql = self._statement(
+            model_class, ('delete_where', where, returning),
+            self._build_delete_where_sql, model_class.__tablename__, where, returning
+        )
+
+        rows = await self._execute(sql, values)
+        self._invalidate(model_class)
+        return rows if returning else rows[0]['count']
+
+    async def select(self, model_class, filters={}, ordering=[], limit=None, columns=None, related=(),
+                     annotations=(), after=None, cache_ttl=None):
         """
         Builds and executes a SELECT ... WHERE ... statement.
+        `columns` restricts the select list; by default every column is read.
+        `related` names ForeignKeys whose targets are JOINed into the same rows
+        as `<name>__<column>` (see `select_related()`).
+        `annotations` adds (alias, function, column, distinct) aggregates, grouped
+        by `columns`; with `columns=()` the whole result is one aggregated row.
+        `after` holds one value per `ordering` column: only rows that sort
+        after them are returned (keyset pagination, see `paginate_after()`).
+        With `cache_ttl` (seconds), the result is served from and stored in
+        the result cache, keyed on the SQL and its parameters.
         """
         table_name = model_class.__tablename__
-        
-        # The loop now correctly iterates over the `filters` dictionary
-        # instead of the non-existent `kwargs`.
-        where_clauses = []
+
+        where, values = self._filter_params(filters)
+
+        if after is not None:
+            values.extend(after)
+
+        # The LIMIT is sent as a parameter, so the SQL only depends on
+        # whether there is a limit, not on its value.
+        if limit is not None:
+            values.append(limit)
+
+        joins, tables = self._join_plan(model_class, related)
+        sql = self._statement(
+            model_class, ('select', where, tuple(ordering), limit is not None, columns, related, annotations,
+                          after is not None),
+            self._build_select_sql, table_name, where, ordering, limit is not None, columns,
+            joins, annotations, after is not None
+        )
+
+        # Inside a transaction, reads may see uncommitted rows: they bypass the cache.
+        if not cache_ttl or self._current_transaction() is not None:
+            # Use the driver to execute the query and return the results
+            return await self._execute(sql, values)
+
+        # The key is taken before the query runs: if a write to any table read
+        # here lands meanwhile, the result is stored under the old versions
+        # and is never served.
+        key = self.result_cache.key(tables, sql, values, source=self.alias)
+        rows = self.result_cache.get(key)
+        if rows is None:
+            rows = await self._execute(sql, values)
+            self.result_cache.put(key, rows, cache_ttl, min_age=self.replica_lag)
+        return rows
+
+    async def count(self, model_class, filters={}):
+        """Returns the number of rows matching the filters, counted by the database."""
+        where, values = self._filter_params(filters)
+        sql = self._statement(
+            model_class, ('count', where), self._build_count_sql, model_class.__tablename__, where
+        )
+        rows = await self._execute(sql, values)
+        return rows[0]['count']
+
+    async def exists(self, model_class, filters={}):
+        """Returns True if at least one row matches the filters, reading at most one row."""
+        where, values = self._filter_params(filters)
+        sql = self._statement(
+            model_class, ('exists', where), self._build_exists_sql, model_class.__tablename__, where
+        )
+        rows = await self._execute(sql, values)
+        return bool(rows)
+
+    async def select_in(self, model_class, column, values):
+        """
+        Selects the rows whose `column` is any of `values`, with a single
+        array parameter (`WHERE "column" = ANY($1)`), so the SQL is the same
+        for any number of values. Used to prefetch related rows in one query.
+        """
+        sql = self._statement(
+            model_class, ('select_in', column),
+            self._build_select_in_sql, model_class.__tablename__, column, model_class._meta.pk_name
+        )
+        return await self._execute(sql, [list(values)])
+
+    async def iterate(self, model_class, filters={}, ordering=[], chunk_size=2000, columns=None, related=(),
+                      annotations=()):
+        """
+        Streams the rows of a SELECT in chunks of `chunk_size` through a
+        server-side cursor (`DECLARE ... CURSOR` + `FETCH FORWARD`).
+        Only one chunk is ever held in memory. This is an async generator.
+
+        The cursor holds a pooled connection of its own while it is open, so
+        queries made while iterating need a second one. With a pool of
+        `max_size=1` it shares the task's connection instead: those queries
+        then run in the cursor's transaction, which is committed when the
+        iteration ends.
+        """
+        where, values = self._filter_params(filters)
+        select_sql = self._statement(
+            model_class, ('select', where, tuple(ordering), False, columns, related, annotations, False),
+            self._build_select_sql, model_class.__tablename__, where, ordering, False, columns,
+            self._join_plan(model_class, related)[0], annotations, False
+        )
+
+        self._cursor_counter += 1
+        cursor_name = f"swiftorm_cursor_{self._cursor_counter}"
+
+        # The cursor lives in a transaction on its own connection, which stays
+        # checked out until the iteration finishes or is abandoned. Inside
+        # atomic(), the cursor joins that transaction instead of opening one.
+        async with self._cursor_connection() as conn:
+            in_transaction = conn in self._transactions
+            shared = self.pool.current_connection() is conn
+            if not in_transaction:
+                await conn.execute('BEGIN;', [])
+            completed = False
+            try:
+                await conn.execute(f'DECLARE "{cursor_name}" NO SCROLL CURSOR FOR {select_sql[:-1]};', values)
+                while True:
+                    rows = await conn.execute(f'FETCH FORWARD {int(chunk_size)} FROM "{cursor_name}";', [])
+                    if rows:
+                        yield rows
+                    if len(rows) < chunk_size:
+                        break
+                completed = True
+            finally:
+                if in_transaction:
+                    # The enclosing transaction stays open, so the cursor is
+                    # closed here; after an error, that transaction's rollback drops it.
+                    try:
+                        await conn.execute(f'CLOSE "{cursor_name}";', [])
+                    except QueryError:
+                        if completed:
+                            raise
+                # COMMIT/ROLLBACK also closes the cursor. On a shared
+                # connection, the transaction also holds the task's own writes.
+                elif completed or shared:
+                    await conn.execute('COMMIT;', [])
+                else:
+                    await conn.execute('ROLLBACK;', [])
+
+    @asynccontextmanager
+    async def _cursor_connection(self):
+        """
+        The connection a server-side cursor runs on: the task's own one inside
+        atomic() (or when the pool cannot hold two), otherwise a dedicated one
+        that is not pinned to the task, so queries made while iterating never
+        join the cursor's transaction.
+        """
+        if self._current_transaction() is not None or self.pool.max_size == 1:
+            async with self.pool.connection() as conn:
+                yield conn
+            return
+
+        conn = await self.pool.acquire()
+        discard = False
+        try:
+            yield conn
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            # The socket may be left mid-message; never hand it to another task.
+            discard = True
+            raise
+        finally:
+            await self.pool.release(conn, discard=discard)
+
+    @staticmethod
+    def _filter_params(filters):
+        """
+        Splits filters into the keys that shape the WHERE clause and the
+        parameter values. Values never change the SQL text, except for
+        `__isnull`, whose key becomes `<column>__isnull` or `<column>__isnotnull`.
+        """
+        where = []
         values = []
-        i = 1
         for key, value in filters.items():
-            where_clauses.append(f'"{key}" = ${i}')
+            col_name, lookup = split_lookup(key)
+            if lookup == 'isnull':
+                where.append(f"{col_name}__{'isnull' if value else 'isnotnull'}")
+                continue
+            if lookup == 'in':
+                # One array parameter, whatever the number of values.
+                value = list(value)
+            elif lookup == 'startswith':
+                value = escape_like(value) + '%'
+            where.append(key)
             values.append(value)
-            i += 1
-        
+        return tuple(where), values
+
+    def _join_plan(self, model_class, related):
+        """
+        Returns the `_select_joins()` of `related` and every table the query
+        reads, computed once per model and `related` tuple.
+        """
+        plan = self._join_plans.get((model_class, related))
+        if plan is None:
+            joins = self._select_joins(model_class, related)
+            plan = self._join_plans[(model_class, related)] = (
+                joins, (model_class.__tablename__,) + tuple(join[1] for join in joins)
+            )
+        return plan
+
+    @staticmethod
+    def _select_joins(model_class, related):
+        """
+        Describes the JOIN of each ForeignKey in `related` as
+        (name, related table, related PK, FK column, related columns).
+        """
+        meta = model_class._meta
+        joins = []
+        for name in related:
+            related_meta = meta.fields[name].related_model._meta
+            joins.append((name, related_meta.table_name, related_meta.pk_name,
+                          meta.fk_columns[name], related_meta.columns))
+        return tuple(joins)
+
+    # --- SQL BUILDERS ---
+    # These only depend on a statement's shape, never on its values,
+    # so their output can be cached by `_statement()`.
+
+    @staticmethod
+    def _build_insert_sql(table_name, columns, row_count, returning=None):
+        columns_sql = ", ".join(f'"{col_name}"' for col_name in columns)
+
+        # Build placeholders like ($1, $2), ($3, $4)
+        rows_sql = []
+        for row in range(row_count):
+            offset = row * len(columns)
+            placeholders = ', '.join([f'${offset + i + 1}' for i in range(len(columns))])
+            rows_sql.append(f"({placeholders})")
+
+        sql = f'INSERT INTO "{table_name}" ({columns_sql}) VALUES {", ".join(rows_sql)}'
+        if returning:
+            sql += f' RETURNING "{returning}"'
+        return sql + ';'
+
+    @staticmethod
+    def _build_update_sql(table_name, columns, pk_field_name):
+        update_fields = [f'"{col_name}" = ${i + 1}' for i, col_name in enumerate(columns)]
+        return f'UPDATE "{table_name}" SET {", ".join(update_fields)} WHERE "{pk_field_name}" = ${len(columns) + 1};'
+
+    @classmethod
+    def _build_bulk_update_sql(cls, table_name, columns, row_count):
+        # `columns` holds (column name, field) pairs with the PK first.
+        pk_field_name = columns[0][0]
+
+        # Parameters in VALUES have no type of their own, so each one gets an explicit cast.
+        casts = [cls._cast_type(field) for _, field in columns]
+
+        # Build placeholders like ($1::INTEGER, $2::TEXT)
+        rows_sql = []
+        for row in range(row_count):
+            offset = row * len(columns)
+            placeholders = ', '.join([f'${offset + i + 1}::{cast}' for i, cast in enumerate(casts)])
+            rows_sql.append(f"({placeholders})")
+
+        set_sql = ", ".join(f'"{col_name}" = v."{col_name}"' for col_name, _ in columns[1:])
+        alias_sql = ", ".join(f'"{col_name}"' for col_name, _ in columns)
+        return (
+            f'UPDATE "{table_name}" SET {set_sql} '
+            f'FROM (VALUES {", ".join(rows_sql)}) AS v ({alias_sql}) '
+            f'WHERE "{table_name}"."{pk_field_name}" = v."{pk_field_name}" '
+            f'RETURNING "{table_name}"."{pk_field_name}";'
+        )
+
+    @staticmethod
+    def _build_delete_sql(table_name, pk_field_name):
+        return f'DELETE FROM "{table_name}" WHERE "{pk_field_name}" = $1;'
+
+    @staticmethod
+    def _build_where_sql(filters, prefix='', start=1):
+        """
+        Builds the conditions (without 'WHERE') for the given filter keys,
+        numbering parameters from `start`. Returns the SQL and the next number.
+        """
+        where_clauses = []
+        i = start
+        for key in filters:
+            col_name, lookup = split_lookup(key, LOOKUP_SQL)
+            operator = LOOKUP_SQL[lookup]
+            if '{}' in operator:
+                operator = operator.format(f'${i}')
+                i += 1
+            where_clauses.append(f'{prefix}"{col_name}" {operator}')
+
         # Join all filter conditions together with 'AND'.
-        where_sql = " AND ".join(where_clauses)
-        
-        sql = f'SELECT * FROM "{table_name}"'
+        return " AND ".join(where_clauses), i
+
+    @staticmethod
+    def _build_seek_sql(ordering, prefix='', start=1):
+        """
+        Builds the keyset condition "the row sorts after ($start, ...)" for the
+        given ordering. Returns the SQL and the next parameter number.
+        """
+        columns = [(f'{prefix}"{field_name.lstrip("-")}"', field_name.startswith('-')) for field_name in ordering]
+        params = [f'${start + n}' for n in range(len(columns))]
+
+        if len({descending for _, descending in columns}) == 1:
+            # One direction: a row comparison, which a matching index can serve directly.
+            operator = '<' if columns[0][1] else '>'
+            sql = f'({", ".join(col for col, _ in columns)}) {operator} ({", ".join(params)})'
+        else:
+            # Mixed directions: (a > $1) OR (a = $1 AND b < $2) OR ...
+            alternatives = []
+            for n, (col, descending) in enumerate(columns):
+                conditions = [f'{columns[k][0]} = {params[k]}' for k in range(n)]
+                conditions.append(f'{col} {"<" if descending else ">"} {params[n]}')
+                alternatives.append(f'({" AND ".join(conditions)})')
+            sql = f'({" OR ".join(alternatives)})'
+        return sql, start + len(columns)
 
+    @staticmethod
+    def _build_aggregate_sql(annotation, prefix=''):
+        # `annotation` is an (alias, function, column, distinct) tuple; column '*' means every row.
+        alias, function, col_name, distinct = annotation
+        argument = '*' if col_name == '*' else f'{prefix}"{col_name}"'
+        if distinct:
+            argument = f'DISTINCT {argument}'
+        return f'{function}({argument}) AS "{alias}"'
+
+    @classmethod
+    def _build_count_sql(cls, table_name, filters):
+        where_sql, _ = cls._build_where_sql(filters)
+        sql = f'SELECT count(*) AS "count" FROM "{table_name}"'
         if where_sql:
             sql += f" WHERE {where_sql}"
-        
+        return sql + ";"
+
+    @classmethod
+    def _build_exists_sql(cls, table_name, filters):
+        where_sql, _ = cls._build_where_sql(filters)
+        sql = f'SELECT 1 AS "exists" FROM "{table_name}"'
+        if where_sql:
+            sql += f" WHERE {where_sql}"
+        return sql + " LIMIT 1;"
+
+    @classmethod
+    def _build_update_where_sql(cls, table_name, set_columns, filters, returning=None):
+        set_sql = ", ".join(f'"{col_name}" = ${i + 1}' for i, col_name in enumerate(set_columns))
+        where_sql, _ = cls._build_where_sql(filters, start=len(set_columns) + 1)
+        sql = f'UPDATE "{table_name}" SET {set_sql}'
+        if where_sql:
+            sql += f" WHERE {where_sql}"
+        return cls._returning_sql(sql, returning)
+
+    @classmethod
+    def _build_delete_where_sql(cls, table_name, filters, returning=None):
+        where_sql, _ = cls._build_where_sql(filters)
+        sql = f'DELETE FROM "{table_name}"'
+        if where_sql:
+            sql += f" WHERE {where_sql}"
+        return cls._returning_sql(sql, returning)
+
+    @staticmethod
+    def _returning_sql(sql, returning):
+        # The driver only returns rows, not the command tag, so without
+        # `returning` the affected rows are counted by the database instead.
+        if returning:
+            return sql + " RETURNING " + ", ".join(f'"{col_name}"' for col_name in returning) + ";"
+        return f'WITH "affected" AS ({sql} RETURNING 1) SELECT count(*) AS "count" FROM "affected";'
+
+    @staticmethod
+    def _build_select_in_sql(table_name, column, pk_field_name):
+        return f'SELECT * FROM "{table_name}" WHERE "{column}" = ANY($1) ORDER BY "{pk_field_name}" ASC;'
+
+    @staticmethod
+    def _build_select_sql(table_name, filters, ordering, has_limit, columns=None, joins=(), annotations=(),
+                          has_seek=False):
+        # With JOINs, every column is qualified by its table alias: "t" for
+        # the model's own table, "t_<fk name>" for each related table.
+        prefix = '"t".' if joins else ''
+
+        where_sql, i = PostgresEngine._build_where_sql(filters, prefix=prefix)
+
+        if has_seek:
+            seek_sql, i = PostgresEngine._build_seek_sql(ordering, prefix=prefix, start=i)
+            where_sql = f"{where_sql} AND {seek_sql}" if where_sql else seek_sql
+
+        # Select only the requested columns, or all of them.
+        if annotations:
+            # Aggregates are grouped by the selected columns (if any), so the
+            # select list is exactly those columns plus the aggregates.
+            select_list = ", ".join(
+                [f'{prefix}"{col_name}"' for col_name in columns or ()]
+                + [PostgresEngine._build_aggregate_sql(annotation, prefix) for annotation in annotations]
+            )
+        elif columns:
+            select_list = ", ".join(f'{prefix}"{col_name}"' for col_name in columns)
+        else:
+            select_list = f"{prefix}*"
+
+        if joins:
+            join_clauses = []
+            for name, related_table, related_pk, fk_column, related_columns in joins:
+                alias = f'"t_{name}"'
+                # Related columns are aliased as "<fk name>__<column>" so they
+                # never clash with the model's own columns.
+                select_list += "".join(
+                    f', {alias}."{col_name}" AS "{name}__{col_name}"' for col_name in related_columns
+                )
+                # A LEFT JOIN keeps rows whose foreign key is NULL.
+                join_clauses.append(
+                    f' LEFT JOIN "{related_table}" AS {alias} ON {alias}."{related_pk}" = "t"."{fk_column}"'
+                )
+            sql = f'SELECT {select_list} FROM "{table_name}" AS "t"{"".join(join_clauses)}'
+        else:
+            sql = f'SELECT {select_list} FROM "{table_name}"'
+
+        if where_sql:
+            sql += f" WHERE {where_sql}"
+
+        if annotations and columns:
+            sql += " GROUP BY " + ", ".join(f'{prefix}"{col_name}"' for col_name in columns)
+
         # --- LOGIC FOR ORDER BY ---
         if ordering:
             order_clauses = []
             for field_name in ordering:
                 if field_name.startswith('-'):
                     # Handle descending order
-                    order_clauses.append(f'"{field_name[1:]}" DESC')
+                    order_clauses.append(f'{prefix}"{field_name[1:]}" DESC')
                 else:
                     # Handle ascending order
-                    order_clauses.append(f'"{field_name}" ASC')
+                    order_clauses.append(f'{prefix}"{field_name}" ASC')
             sql += f" ORDER BY {', '.join(order_clauses)}"
         # --- END ---
 
         # --- LOGIC FOR LIMIT ---
-        if limit is not None:
-            sql += f" LIMIT {limit}"
+        if has_limit:
+            sql += f" LIMIT ${i}"
         # --- END ---
 
-        sql += ";"
-
-        # Use the driver to execute the query and return the results
-        return await self.driver.execute(sql, values)
+        return sql + ";"
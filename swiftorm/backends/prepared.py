@@ -0,0 +1,88 @@
+from async_driver.exceptions import QueryError
+
+from .cache import LRUCache
+
+
+# Hooks a driver connection must provide for named prepared statements:
+#   await conn.prepare(name, sql)             -> Parse (+ Describe) once
+#   await conn.execute_prepared(name, values) -> Bind/Execute only
+#   await conn.close_statement(name)          -> Close the server-side statement
+DRIVER_HOOKS = ('prepare', 'execute_prepared', 'close_statement')
+
+# PostgreSQL refuses to reuse a prepared plan whose result shape changed
+# (e.g. after ALTER TABLE); such statements have to be parsed again.
+STALE_PLAN_MESSAGES = ('cached plan must not change result type', 'cached plan must not be replanned')
+
+
+def supports_prepared_statements(conn):
+    """Returns True if the driver connection exposes the named-statement hooks."""
+    return all(callable(getattr(conn, hook, None)) for hook in DRIVER_HOOKS)
+
+
+def is_stale_plan_error(error):
+    message = str(error).lower()
+    return any(text in message for text in STALE_PLAN_MESSAGES)
+
+
+class PreparedStatementCache:
+    """
+    A per-connection LRU of named prepared statements, keyed by SQL text.
+    The first run of a statement parses it under a generated name; later runs
+    go straight to Bind/Execute.
+    """
+    def __init__(self, conn, maxsize=100):
+        self.conn = conn
+        self._statements = LRUCache(maxsize)
+        self._counter = 0
+        self.invalidations = 0
+
+    async def prepare(self, sql):
+        """Returns the statement name for `sql`, parsing it on the server if needed."""
+        name = self._statements.get(sql)
+        if name is not None:
+            return name
+
+        self._counter += 1
+        name = f"swiftorm_stmt_{self._counter}"
+        await self.conn.prepare(name, sql)
+
+        # Make room first so the evicted statement can be closed on the server too.
+        if self._statements.maxsize and len(self._statements) >= self._statements.maxsize:
+            _, old_name = self._statements.pop_oldest()
+            await self.conn.close_statement(old_name)
+        self._statements.put(sql, name)
+        return name
+
+    async def execute(self, sql, values):
+        """Runs `sql` through its named statement, re-preparing once if the plan went stale."""
+        name = await self.prepare(sql)
+        try:
+            return await self.conn.execute_prepared(name, values)
+        except QueryError as e:
+            if not is_stale_plan_error(e):
+                raise
+            await self.invalidate(sql)
+            name = await self.prepare(sql)
+            return await self.conn.execute_prepared(name, values)
+
+    async def invalidate(self, sql=None):
+        """Forgets (and closes) one cached statement, or all of them when `sql` is None."""
+        if sql is None:
+            names = [self._statements.pop(key) for key in self._statements.keys()]
+        else:
+            names = [self._statements.pop(sql)]
+
+        for name in names:
+            if name is None:
+                continue
+            self.invalidations += 1
+            try:
+                await self.conn.close_statement(name)
+            except QueryError:
+                # The server may already have dropped it; forgetting it is enough.
+                pass
+
+    def stats(self):
+        stats = self._statements.stats()
+        stats['invalidations'] = self.invalidations
+        return stats
@@ -0,0 +1,45 @@
+"""
+SQL aggregate functions for `QuerySet.aggregate()` and `QuerySet.annotate()`.
+
+    await Product.objects.aggregate(total=Sum('price'), n=Count('sku'))
+    await Post.objects.values('author_id').annotate(n=Count('id')).all()
+"""
+
+
+class Aggregate:
+    """An aggregate function computed by the database over one field."""
+    function = None
+
+    def __init__(self, field, distinct=False):
+        self.field = field
+        self.distinct = distinct
+
+    def __repr__(self):
+        distinct = ", distinct=True" if self.distinct else ""
+        return f"{type(self).__name__}({self.field!r}{distinct})"
+
+
+class Count(Aggregate):
+    """Counts rows, or the non-null values of a field. `Count()` is `count(*)`."""
+    function = 'COUNT'
+
+    def __init__(self, field='*', distinct=False):
+        if field == '*' and distinct:
+            raise ValueError("Count('*') cannot be distinct; name a field instead.")
+        super().__init__(field, distinct=distinct)
+
+
+class Sum(Aggregate):
+    function = 'SUM'
+
+
+class Avg(Aggregate):
+    function = 'AVG'
+
+
+class Min(Aggregate):
+    function = 'MIN'
+
+
+class Max(Aggregate):
+    function = 'MAX'
@@ -25,4 +25,9 @@ class ObjectNotFound(ORMError):
 
 class MultipleObjectsReturned(ORMError):
     """Raised by `get()` when more than one object is returned."""
-    pass
\ No newline at end of file
+    pass
+
+
+class PoolTimeoutError(ORMError):
+    """Raised when no pooled connection becomes available within the acquire timeout."""
+    pass
@@ -0,0 +1,62 @@
+"""
+Field lookups for `QuerySet.filter()`, written as `<field>__<lookup>=value`
+(e.g. `age__gte=18`, `id__in=[1, 2, 3]`). A key without a suffix is `exact`.
+"""
+from .fields import TextField
+from . import exceptions
+
+
+LOOKUP_SEPARATOR = '__'
+
+LOOKUPS = frozenset({'exact', 'in', 'gt', 'gte', 'lt', 'lte', 'isnull', 'startswith'})
+
+
+def split_lookup(key, lookups=LOOKUPS):
+    """Splits 'age__gte' into ('age', 'gte'), and 'age' into ('age', 'exact')."""
+    name, separator, lookup = key.rpartition(LOOKUP_SEPARATOR)
+    if separator and lookup in lookups:
+        return name, lookup
+    return key, 'exact'
+
+
+def prepare_lookup_value(lookup, value):
+    """
+    Materializes the operand of an `__in` lookup once, so a generator or any
+    other one-shot iterable is not used up by validation before it is bound.
+    """
+    if lookup == 'in' and not isinstance(value, (list, tuple, str, bytes)) and hasattr(value, '__iter__'):
+        return tuple(value)
+    return value
+
+
+def validate_lookup(name, field, lookup, value):
+    """
+    Checks that `value` is a valid operand for `<name>__<lookup>`.
+    Raises ValidationError otherwise.
+    """
+    if lookup == 'isnull':
+        if not isinstance(value, bool):
+            raise exceptions.ValidationError(f"'{name}__isnull' expects True or False, but got {type(value).__name__}.")
+        return
+
+    if lookup == 'in':
+        if isinstance(value, (str, bytes)) or not hasattr(value, '__iter__'):
+            raise exceptions.ValidationError(f"'{name}__in' expects a list of values, but got {type(value).__name__}.")
+        for item in value:
+            field.validate(item)
+        return
+
+    if lookup == 'startswith':
+        if not isinstance(field, TextField):
+            raise exceptions.ValidationError(f"'{name}__startswith' can only be used on text fields.")
+        if not isinstance(value, str):
+            raise exceptions.ValidationError(f"'{name}__startswith' expects a string, but got {type(value).__name__}.")
+        return
+
+    # exact, gt, gte, lt, lte compare against a single value of the field's type.
+    field.validate(value)
+
+
+def escape_like(value):
+    """Escapes the LIKE wildcards in `value`, so it only ever matches literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
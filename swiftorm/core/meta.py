@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
+
+from .fields import Field, IntegerField, ForeignKey
+
+
+@dataclass(frozen=True)
+class ModelMeta:
+    """
+    Everything the ORM needs to know about a model's table, computed once by
+    `ModelMetaclass` so that hot paths never rescan the field dictionaries.
+    """
+    table_name: str
+    quoted_table: str
+    # Field name -> Field, regular fields first, then foreign keys (table order).
+    fields: Mapping[str, Field]
+    # Column names in table order; a ForeignKey `author` is stored as `author_id`.
+    columns: Tuple[str, ...]
+    # Field name -> column name, and column name -> Field.
+    field_columns: Mapping[str, str]
+    column_fields: Mapping[str, Field]
+    # ForeignKey field name -> column name.
+    fk_columns: Mapping[str, str]
+    # Column name -> '"column"', ready to be used in SQL.
+    quoted_columns: Mapping[str, str]
+    pk_name: str
+    pk_field: Field
+    # True when the primary key is an IntegerField, which is created as SERIAL.
+    auto_pk: bool
+    non_pk_columns: Tuple[str, ...]
+    # (column name, default) pairs set by `Model.__init__`.
+    defaults: Tuple[Tuple[str, Any], ...]
+    # Columns in the order `__repr__` shows them: PK first, then by field name.
+    repr_columns: Tuple[str, ...]
+
+    @classmethod
+    def build(cls, table_name, fields, foreign_keys):
+        """Builds the metadata from the (already validated) field dictionaries."""
+        all_fields = {**fields, **foreign_keys}
+
+        field_columns = {}
+        for name, field in all_fields.items():
+            field_columns[name] = f"{name}_id" if isinstance(field, ForeignKey) else name
+
+        columns = tuple(field_columns.values())
+        column_fields = {field_columns[name]: field for name, field in all_fields.items()}
+        pk_name = next(name for name, field in fields.items() if field.primary_key)
+        pk_field = fields[pk_name]
+
+        repr_columns = (pk_name,) + tuple(
+            field_columns[name] for name in sorted(all_fields) if name != pk_name
+        )
+
+        return cls(
+            table_name=table_name,
+            quoted_table=f'"{table_name}"',
+            fields=MappingProxyType(all_fields),
+            columns=columns,
+            field_columns=MappingProxyType(field_columns),
+            column_fields=MappingProxyType(column_fields),
+            fk_columns=MappingProxyType({name: field_columns[name] for name in foreign_keys}),
+            quoted_columns=MappingProxyType({col_name: f'"{col_name}"' for col_name in columns}),
+            pk_name=pk_name,
+            pk_field=pk_field,
+            auto_pk=isinstance(pk_field, IntegerField),
+            non_pk_columns=tuple(col_name for col_name in columns if col_name != pk_name),
+            defaults=tuple((field_columns[name], field.default) for name, field in all_fields.items()),
+            repr_columns=repr_columns,
+        )
+
+    def column_for(self, name):
+        """
+        Returns the column for a field name or column name ('author' and
+        'author_id' both give 'author_id'), or None if there is no such column.
+        """
+        col_name = self.field_columns.get(name)
+        if col_name is None and name in self.column_fields:
+            col_name = name
+        return col_name
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod, ABCMeta
 from .fields import Field, TextField, ForeignKey
+from .meta import ModelMeta
+from .session import current_session
 from . import exceptions
 from .. import db 
 
@@ -9,6 +11,15 @@ from .query import QuerySet
 # A central registry to store all defined model classes.
 _model_registry = []
 
+# Per-instance bookkeeping attributes. Compact models reserve a slot for each.
+_INSTANCE_STATE = (
+    '_is_new', '_original_values', '_original_pk_name', '_original_pk_value', '_prefetched'
+)
+
+# Stands for a column that was not loaded (see `only()`) in dirty-tracking
+# snapshots, so that any value assigned to it later counts as a change.
+_UNLOADED = object()
+
 
 class ModelMetaclass(type):
     """
@@ -16,36 +27,58 @@ class ModelMetaclass(type):
     in our central `_model_registry`.
     """
     def __new__(cls, name, bases, attrs):
+        # Start with the fields inherited from (abstract) base models, so the
+        # most derived definition of a field wins.
+        fields = {}
+        foreign_keys = {}
+        for base in reversed(bases):
+            fields.update(getattr(base, '_fields', {}))
+            foreign_keys.update(getattr(base, '_foreign_keys', {}))
+
+        # Find all attributes that are instances of Field, and take them out of
+        # the class body: the values live on the instances, not on the class.
+        attrs = dict(attrs)
+        for key, value in list(attrs.items()):
+            if isinstance(value, ForeignKey):
+                fields.pop(key, None)
+                foreign_keys[key] = value
+                del attrs[key]
+            elif isinstance(value, Field):
+                foreign_keys.pop(key, None)
+                fields[key] = value
+                del attrs[key]
+
+        if attrs.get('__abstract__', False):
+            # Abstract bases must not add a `__dict__` of their own, so that
+            # compact subclasses can stay dict-free.
+            attrs.setdefault('__slots__', ())
+        elif attrs.get('__compact__', any(getattr(base, '__compact__', False) for base in bases)) \
+                and '__slots__' not in attrs:
+            # Compact models store every column and the bookkeeping state in
+            # slots instead of a per-instance `__dict__`.
+            attrs['__slots__'] = _compact_slots(bases, fields, foreign_keys)
+
         new_class = super().__new__(cls, name, bases, attrs)
-        
-        # We only register classes that are not the base Model itself
-        # and are not marked as abstract. This is the main addition.
-        if name != "Model" and not attrs.get('__abstract__', False):
-            _model_registry.append(new_class)
-        
+
         # The rest of the logic remains the same as before, but acts on the
         # `new_class` object created at the beginning.
         if name == "Model":
             return new_class
 
+        setattr(new_class, '_fields', fields)
+        setattr(new_class, '_foreign_keys', foreign_keys) # <-- Store it on the class
+
+        # Abstract models only provide fields to their subclasses: they have
+        # no table, no manager and no primary key requirement.
+        if attrs.get('__abstract__', False):
+            return new_class
+
         # --- LOGIC TO ADD `objects` MANAGER ---
         setattr(new_class, 'objects', QuerySet(model_class=new_class))
         # --- END
 
         table_name = attrs.get('__tablename__', name.lower())
         new_class.__tablename__ = table_name
-
-        # Find all attributes that are instances of Field.
-        fields = {}
-        foreign_keys = {} 
-        for key, value in attrs.items():
-            if isinstance(value, ForeignKey):
-                foreign_keys[key] = value
-            elif isinstance(value, Field):
-                fields[key] = value
-        
-        setattr(new_class, '_fields', fields)
-        setattr(new_class, '_foreign_keys', foreign_keys) # <-- Store it on the class
         
         # --- THIS IS THE NEW VALIDATION LOGIC ---
         # After gathering fields, we validate the primary key constraint.
@@ -56,15 +89,145 @@ class ModelMetaclass(type):
         if pk_count > 1:
             raise TypeError(f"Model '{name}' cannot have more than one primary key field.")
         # --- END OF NEW LOGIC ---
-        
 
-        # We now need to remove both types of fields from the class attributes
-        for key in list(fields.keys()) + list(foreign_keys.keys()):
-            delattr(new_class, key)
-            
+        # Everything derived from the fields is computed once, here.
+        new_class._meta = ModelMeta.build(table_name, fields, foreign_keys)
+
+        # Compile the fast path that turns database rows into instances.
+        new_class._load_row = staticmethod(_compile_row_loader(new_class))
+
+        # Reverse relations other models declare to this one, by accessor name.
+        new_class._reverse_relations = {}
+        relations = _reverse_relations_of(new_class, foreign_keys)
+
+        # Nothing below can fail: the class is only registered, and its
+        # ForeignKeys only exposed on their targets, once it is fully valid.
+        _model_registry.append(new_class)
+        for target, relation in relations:
+            target._reverse_relations[relation.accessor] = relation
+            setattr(target, relation.accessor, relation)
+
         return new_class
 
 
+class ReverseRelation:
+    """
+    The reverse side of a ForeignKey, registered on its target model as
+    `<model>_set` (e.g. `Author.post_set` for `Post.author`), or as
+    `<model>_<fk>_set` when the model has several ForeignKeys to that target
+    (e.g. `User.message_sender_set` and `User.message_recipient_set`).
+    Reading it on an instance returns the list loaded by `prefetch_related()`.
+    """
+    def __init__(self, model_class, fk_name, accessor=None):
+        self.model_class = model_class
+        self.fk_name = fk_name
+        self.column = model_class._meta.fk_columns[fk_name]
+        self.accessor = accessor or f"{model_class.__name__.lower()}_set"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        prefetched = getattr(instance, '_prefetched', None)
+        if prefetched is None or self.accessor not in prefetched:
+            raise AttributeError(
+                f"'{self.accessor}' was not loaded; use prefetch_related('{self.accessor}') "
+                f"or {self.model_class.__name__}.objects.filter({self.column}=...)."
+            )
+        return prefetched[self.accessor]
+
+
+def _reverse_relations_of(model_class, foreign_keys):
+    """Returns the (target model, ReverseRelation) pairs for a model's ForeignKeys."""
+    targets = [fk.related_model for fk in foreign_keys.values()]
+    prefix = model_class.__name__.lower()
+    relations = []
+    for fk_name, fk in foreign_keys.items():
+        target = fk.related_model
+        accessor = f"{prefix}_{fk_name}_set" if targets.count(target) > 1 else None
+        relations.append((target, ReverseRelation(model_class, fk_name, accessor)))
+    return relations
+
+
+def _compact_slots(bases, fields, foreign_keys):
+    """Returns the `__slots__` of a compact model, minus slots its bases already define."""
+    taken = set()
+    for base in bases:
+        for klass in base.__mro__:
+            slots = klass.__dict__.get('__slots__', ())
+            taken.update((slots,) if isinstance(slots, str) else slots)
+
+    names = list(fields)
+    names += [f"{name}_id" for name in foreign_keys]
+    # The foreign key names themselves hold instances attached by `select_related()`.
+    names += list(foreign_keys)
+    names += _INSTANCE_STATE
+    return tuple(name for name in names if name not in taken)
+
+
+def _compile_row_loader(model_class):
+    """
+    Builds the function that turns one result row into a persisted instance
+    of `model_class`. Everything that does not depend on the row (the PK name,
+    the constructor) is looked up once here, not once per row.
+    """
+    if model_class.__compact__:
+        return _compile_compact_row_loader(model_class)
+
+    pk_name = model_class._meta.pk_name
+    new_instance = object.__new__
+
+    def load_row(row):
+        instance = new_instance(model_class)
+        state = instance.__dict__
+        # Result columns are named like the attributes (`<fk>_id` for foreign
+        # keys), so one update maps the whole row.
+        state.update(row)
+        state['_is_new'] = False
+        state['_original_pk_name'] = pk_name
+        state['_original_pk_value'] = row.get(pk_name)
+        # The row itself becomes the dirty-tracking snapshot.
+        state['_original_values'] = row
+        return instance
+
+    return load_row
+
+
+def _compile_compact_row_loader(model_class):
+    """
+    The row loader for compact (`__slots__`) models: values are written
+    straight through the slot descriptors, and the snapshot is a tuple of
+    values in column order rather than the row dict, so no dict is kept alive.
+    """
+    meta = model_class._meta
+    pk_name = meta.pk_name
+    columns = meta.columns
+    new_instance = object.__new__
+    setters = {col_name: getattr(model_class, col_name).__set__ for col_name in columns}
+    set_is_new = model_class._is_new.__set__
+    set_pk_name = model_class._original_pk_name.__set__
+    set_pk_value = model_class._original_pk_value.__set__
+    set_snapshot = model_class._original_values.__set__
+    unloaded = (_UNLOADED,) * len(columns)
+
+    def load_row(row):
+        instance = new_instance(model_class)
+        for col_name, value in row.items():
+            setter = setters.get(col_name)
+            if setter is None:
+                setattr(instance, col_name, value)
+            else:
+                setter(instance, value)
+        set_is_new(instance, False)
+        set_pk_name(instance, pk_name)
+        set_pk_value(instance, row.get(pk_name))
+        # Columns missing from the row (see `only()`) are never set; like a
+        # row dict without their key, the snapshot records them as unloaded.
+        set_snapshot(instance, tuple(map(row.get, columns, unloaded)))
+        return instance
+
+    return load_row
+
+
 # We create a new metaclass that inherits from BOTH our custom metaclass and ABC's metaclass.
 class CombinedMeta(ModelMetaclass, ABCMeta):
     """A combined metaclass to resolve the conflict."""
@@ -81,26 +244,32 @@ class Model(ABC, metaclass=CombinedMeta):
     # in the `_model_registry`.
     __abstract__ = True
 
+    # Set `__compact__ = True` on a model to store its instances in
+    # `__slots__` instead of a `__dict__`: less memory per row and faster
+    # attribute access, but no attributes besides the columns can be set.
+    __compact__ = False
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         """
         Initializes a model instance.
         It now expects foreign keys to be passed with an `_id` suffix.
         """
-        all_fields = {**self._fields, **self._foreign_keys}
+        meta = self._meta
 
         self._is_new = True 
+        # Column values as last read from / written to the database.
+        # `None` means there is no snapshot, so every column counts as changed.
+        self._original_values = None
 
         # First, initialize all fields with their default value
-        for name, field in all_fields.items():
-            if isinstance(field, ForeignKey):
-                setattr(self, f"{name}_id", field.default)
-            else:
-                setattr(self, name, field.default)
+        for col_name, default in meta.defaults:
+            setattr(self, col_name, default)
 
         # Then, overwrite with any values provided by the user
         for key, value in kwargs.items():
             # Check for regular fields OR fk fields with _id suffix
-            if key in self._fields or (key.endswith('_id') and key[:-3] in self._foreign_keys):
+            if key in meta.column_fields:
                  setattr(self, key, value)
             # We don't check for the `author` object anymore, only `author_id`
             elif key in self._foreign_keys:
@@ -112,32 +281,26 @@ class Model(ABC, metaclass=CombinedMeta):
         """
         A more robust representation that correctly displays the primary key and all fields.
         """
-        all_fields = {**self._fields, **self._foreign_keys}
-        attrs_list = []
-        
-        # Find and add the primary key first for clarity
-        pk_name = self._get_pk_name()
-
-        if pk_name:
-             attrs_list.append(f"{pk_name}={getattr(self, pk_name, None)}")
-
-        for key in sorted(all_fields.keys()):
-            if key == pk_name: continue # Skip if it's the PK, we already added it
-            
-            if isinstance(all_fields[key], ForeignKey):
-                attrs_list.append(f'{key}_id={getattr(self, f"{key}_id", None)}')
-            else:
-                attrs_list.append(f'{key}={getattr(self, key, None)}')
+        # The primary key comes first for clarity, then the other columns
+        # sorted by field name (foreign keys are shown as `<name>_id`).
+        attrs_list = [f"{col_name}={getattr(self, col_name, None)}" for col_name in self._meta.repr_columns]
         return f"<{type(self).__name__}: {', '.join(attrs_list)}>"
 
+    @classmethod
+    def _from_db_row(cls, row):
+        """
+        Builds a persisted instance straight from a result row, without running
+        `__init__` (no defaults, no kwarg checks). Columns missing from the row
+        stay unloaded (see `only()`). The row dict is kept as the instance's
+        snapshot, so callers must not reuse it.
+        """
+        return cls._load_row(row)
+
     @classmethod
     def _get_pk_name(cls):
-        """Finds the name of the primary key field for this model."""
-        # Note: we use cls._fields instead of self._fields
-        for name, field in cls._fields.items():
-            if field.primary_key:
-                return name
-        return None
+        """Returns the name of the primary key field for this model."""
+        # Computed once by the metaclass; see ModelMeta.
+        return cls._meta.pk_name
 
     def _set_original_pk(self):
         """
@@ -148,20 +311,73 @@ class Model(ABC, metaclass=CombinedMeta):
             self._original_pk_name = pk_name
             self._original_pk_value = getattr(self, pk_name)
 
+    def _take_snapshot(self):
+        """
+        Private method to record the current column values after load/save,
+        so `save()` can later tell which columns were modified.
+        """
+        if self.__compact__:
+            self._original_values = tuple(getattr(self, col_name, _UNLOADED) for col_name in self._meta.columns)
+        else:
+            self._original_values = {col_name: getattr(self, col_name, _UNLOADED) for col_name in self._meta.columns}
+
+    def _refresh_snapshot(self, columns):
+        """
+        Records the current values of `columns` only, after a write of just
+        those columns: changes to the others must still be saved later.
+        """
+        snapshot = self._original_values
+        if snapshot is None:
+            return
+        if isinstance(snapshot, tuple):
+            positions = self._meta.columns
+            values = list(snapshot)
+            for col_name in columns:
+                values[positions.index(col_name)] = getattr(self, col_name, _UNLOADED)
+            self._original_values = tuple(values)
+        else:
+            self._original_values = {**snapshot, **{col_name: getattr(self, col_name, _UNLOADED) for col_name in columns}}
+
+    def _mark_persisted(self):
+        """
+        Private method to flag an instance as stored in the database,
+        after it has been loaded, created or saved.
+        """
+        self._is_new = False
+        self._set_original_pk()
+        self._take_snapshot()
+
+    def _get_dirty_columns(self):
+        """Returns the names of the columns whose values changed since the last snapshot."""
+        dirty = []
+        snapshot = self._original_values
+        # Compact models keep their snapshot as a tuple in column order.
+        if isinstance(snapshot, tuple):
+            snapshot = dict(zip(self._meta.columns, snapshot))
+
+        for col_name in self._meta.non_pk_columns:
+            value = getattr(self, col_name, _UNLOADED)
+            # Columns that were never loaded (see `only()`) and never set are left alone.
+            if value is _UNLOADED:
+                continue
+            if snapshot is None or snapshot.get(col_name, _UNLOADED) != value:
+                dirty.append(col_name)
+        return dirty
+
     def validate(self):
         """
         Runs validation checks for all fields, including ForeignKeys.
         """
-        # We combine both dictionaries to check all fields.
-        all_fields = {**self._fields, **self._foreign_keys}
+        missing = object()
 
-        for name, field in all_fields.items():
-            
-            # For ForeignKeys, we check the `_id` attribute.
-            if isinstance(field, ForeignKey):
-                value = getattr(self, f"{name}_id", None)
-            else:
-                value = getattr(self, name, None)
+        # For ForeignKeys, we check the `_id` column.
+        for name, col_name in self._meta.field_columns.items():
+            field = self._meta.fields[name]
+            value = getattr(self, col_name, missing)
+
+            # Columns that were not loaded (see `only()`) are not written either.
+            if value is missing:
+                continue
 
             # Now we run the checks.
             if field.required and value is None:
@@ -183,13 +399,23 @@ class Model(ABC, metaclass=CombinedMeta):
         # We now use the `_is_new` flag to decide between INSERT and UPDATE
         if self._is_new:
             await db.engine.insert(self)
-            # After the first insert, it's not new anymore
-            self._is_new = False
+            session = current_session()
+            if session is not None:
+                session.add(self)
         else:
             pk_name = self._get_pk_name()
-            if pk_name and self._original_pk_name and getattr(self, pk_name) != self._original_pk_value:
+            if pk_name and getattr(self, '_original_pk_name', None) and getattr(self, pk_name) != self._original_pk_value:
                 raise exceptions.ValidationError(f"Primary key '{pk_name}' cannot be changed.")
-            await db.engine.update(self)
+
+            # Only the modified columns are written; an unchanged instance
+            # does not need a round trip at all.
+            dirty_columns = self._get_dirty_columns()
+            if not dirty_columns:
+                return
+            await db.engine.update(self, columns=dirty_columns)
+
+        # After the first insert (or any update), the database matches the instance.
+        self._mark_persisted()
 
     async def delete(self):
         """
@@ -202,3 +428,10 @@ class Model(ABC, metaclass=CombinedMeta):
             raise exceptions.ORMError("Cannot delete an unsaved instance.")
         
         await db.engine.delete(self)
+
+        # The row is gone, and cascades may have changed the rows referencing it.
+        session = current_session()
+        if session is not None:
+            session.discard(self)
+            for relation in self._reverse_relations.values():
+                session.evict(relation.model_class)
@@ -1,56 +1,468 @@
+import base64
+import binascii
+import json
+
 from . import exceptions
+from .lookups import split_lookup, validate_lookup, prepare_lookup_value
+from .aggregates import Aggregate
+from .session import current_session
 from .. import db
-import copy
 
 
 from async_driver.exceptions import QueryError
 
 
+def _encode_cursor(ordering, values):
+    """Packs the sort key of the last row of a page into an opaque, URL-safe token."""
+    payload = json.dumps([list(ordering), list(values)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor, ordering):
+    """Unpacks a token from `_encode_cursor()`, checking it was made for this ordering."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_ordering, values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(cursor_ordering, list) or not isinstance(values, list):
+            raise ValueError
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid pagination cursor.")
+    if cursor_ordering != list(ordering) or len(values) != len(ordering):
+        raise ValueError("The pagination cursor was made for a different ordering.")
+    return values
+
+
 class QuerySet:
     """
     Manages and executes database queries for a model.
+
+    A QuerySet is never modified after it is created: every chainable method
+    returns a clone. All of its state is immutable, so a clone is a shallow copy
+    that shares the conditions of its parent, and chaining costs O(1) per step.
     """
     def __init__(self, model_class):
         self.model_class = model_class
-        # This will now store our WHERE conditions
-        self._filters = {}
-        # This new list will store our ORDER BY conditions
-        self._ordering = []
+        # WHERE and ORDER BY conditions are stored as linked nodes of the form
+        # (parent_node, items). Each filter()/order_by() call adds one node on
+        # top of the shared chain instead of copying it.
+        self._filter_node = None
+        self._ordering_node = None
+        # The flattened `_filters` / `_ordering`, built on first use.
+        self._compiled = None
+        # What the query returns: 'model' instances, 'values' dicts or
+        # 'values_list' tuples, and which columns it selects (None means all).
+        self._result_type = 'model'
+        self._columns = None
+        self._flat = False
+        # ForeignKey names whose targets are loaded in the same query.
+        self._related = ()
+        # Reverse relation accessors loaded with one extra query each.
+        self._prefetch = ()
+        # Aggregates added by annotate(), as (alias, function, column, distinct).
+        self._annotations = ()
+        # Seconds results may be served from the engine's result cache (see cached()).
+        self._cache_ttl = None
+
+    def _clone(self):
+        """Returns a new QuerySet sharing this one's (immutable) state."""
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone._compiled = None
+        return clone
+
+    def _compile(self):
+        """Flattens the condition chains into a filters dict and an ordering list."""
+        if self._compiled is None:
+            filter_items = []
+            node = self._filter_node
+            while node is not None:
+                node, items = node
+                filter_items.append(items)
+            filters = {}
+            # Apply the oldest filter() call first, so later ones win like dict.update().
+            for items in reversed(filter_items):
+                for key, value in items:
+                    filters[self._filter_key(key)] = value
+
+            ordering_items = []
+            node = self._ordering_node
+            while node is not None:
+                node, items = node
+                ordering_items.append(items)
+            ordering = [field_name for items in reversed(ordering_items) for field_name in items]
+
+            self._compiled = (filters, ordering)
+        return self._compiled
+
+    def _filter_key(self, key):
+        """
+        Normalizes a filter key to its column name ('author' -> 'author_id',
+        'pk' -> the primary key) and drops the implicit '__exact' suffix.
+        """
+        meta = self.model_class._meta
+        name, lookup = split_lookup(key)
+        if name == 'pk':
+            name = meta.pk_name
+        col_name = meta.column_for(name) or name
+        return col_name if lookup == 'exact' else f"{col_name}__{lookup}"
+
+    @property
+    def _filters(self):
+        """The WHERE conditions as a dict of column name (with lookup suffix) -> value."""
+        return self._compile()[0]
+
+    @property
+    def _ordering(self):
+        """The ORDER BY conditions as a list like ['username', '-id']."""
+        return self._compile()[1]
+
+    def _resolve_columns(self, names):
+        """
+        Maps field names to column names (a ForeignKey 'author' or 'author_id'
+        becomes 'author_id'). Unknown names are rejected, so only real columns
+        ever reach the SQL.
+        """
+        meta = self.model_class._meta
+        columns = []
+        for name in names:
+            col_name = meta.column_for(name)
+            if col_name is None:
+                raise AttributeError(f"'{self.model_class.__name__}' object has no attribute '{name}'")
+            if col_name not in columns:
+                columns.append(col_name)
+        return tuple(columns)
+
+    def _all_columns(self):
+        """Returns every column of the model, in table order."""
+        return self.model_class._meta.columns
+
+    def _hydrate(self, rows):
+        """Turns raw result rows into what this QuerySet returns."""
+        if self._result_type == 'values':
+            return rows
+
+        if self._result_type == 'values_list':
+            if self._flat:
+                col_name = self._columns[0]
+                return [row[col_name] for row in rows]
+            columns = self._columns + tuple(alias for alias, *_ in self._annotations)
+            return [tuple(row[col_name] for col_name in columns) for row in rows]
+
+        return self._load_instances(rows)
+
+    def _load_instances(self, rows):
+        """
+        Converts raw data rows into model instances (partially loaded after
+        only()) with the precompiled loader instead of Model.__init__.
+        """
+        load_row = self.model_class._load_row
+        session = current_session()
+        if not self._related:
+            instances = [load_row(row) for row in rows]
+            if session is None:
+                return instances
+            return [self._in_session(session, instance) for instance in instances]
+
+        # For each select_related() ForeignKey: its name, the related model, the
+        # (aliased key, column) pairs to split off each row, and the instances
+        # already loaded, so a target shared by many rows is built only once.
+        meta = self.model_class._meta
+        joins = []
+        for name in self._related:
+            related_model = meta.fields[name].related_model
+            related_meta = related_model._meta
+            keys = [(f"{name}__{col_name}", col_name) for col_name in related_meta.columns]
+            joins.append((name, related_model._load_row, keys, related_meta.pk_name, {}))
+
+        instances = []
+        for row in rows:
+            related = []
+            for name, load_related, keys, related_pk, loaded in joins:
+                related_row = {col_name: row.pop(key, None) for key, col_name in keys}
+                pk_value = related_row[related_pk]
+                if pk_value is None:
+                    # The foreign key is NULL (or points nowhere): nothing to attach.
+                    target = None
+                else:
+                    target = loaded.get(pk_value)
+                    if target is None:
+                        target = loaded[pk_value] = load_related(related_row)
+                        if session is not None:
+                            target = loaded[pk_value] = session.add(target)
+                related.append((name, target))
+
+            # What is left of the row belongs to the model itself.
+            instance = load_row(row)
+            if session is not None:
+                instance = self._in_session(session, instance)
+            for name, target in related:
+                setattr(instance, name, target)
+            instances.append(instance)
+        return instances
 
-    def validate_filters(self):
+    def _in_session(self, session, instance):
         """
-        Validates all filters in self._filters using the model's field validators.
-        Raises ValidationError if any value is invalid for its field type.
+        Resolves a freshly loaded instance to the session's instance for the
+        same row. Partially loaded instances (see `only()`) are never
+        registered, so a later full query cannot return one.
         """
-        for key, value in self._filters.items():
-            field = self.model_class._fields.get(key)
-            if field:
-                field.validate(value)  # Raise ValidationError if invalid (e.g., string for int)
+        if self._columns is not None:
+            return session.get(type(instance), getattr(instance, instance._meta.pk_name, None)) or instance
+        return session.add(instance)
+
+    async def _prefetch_related(self, instances):
+        """
+        Loads every prefetch_related() set for `instances` with one
+        `= ANY($1)` query per relation, groups the children by their foreign
+        key and attaches each group to its parent.
+        """
+        if not self._prefetch or self._result_type != 'model' or not instances:
+            return
+
+        engine = db.read_engine(self.model_class)
+        pk_name = self.model_class._meta.pk_name
+        pk_values = list(dict.fromkeys(
+            pk_value for pk_value in (getattr(instance, pk_name, None) for instance in instances)
+            if pk_value is not None
+        ))
+
+        for accessor in self._prefetch:
+            relation = self.model_class._reverse_relations[accessor]
+            groups = {}
+            if pk_values:
+                try:
+                    rows = await engine.select_in(relation.model_class, relation.column, pk_values)
+                except QueryError as e:
+                    error_msg = str(e).lower()
+                    if "invalid input syntax" in error_msg:
+                        raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+                    raise  # Re-raise other QueryErrors
+                for child in relation.model_class.objects._load_instances(rows):
+                    groups.setdefault(getattr(child, relation.column), []).append(child)
+
+            for instance in instances:
+                children = groups.get(getattr(instance, pk_name, None), [])
+                # Point each child back at its parent, so `child.<fk>` costs no query either.
+                for child in children:
+                    setattr(child, relation.fk_name, instance)
+                prefetched = getattr(instance, '_prefetched', None)
+                if prefetched is None:
+                    prefetched = instance._prefetched = {}
+                prefetched[accessor] = children
+
+    def _query_related(self):
+        """The `related` argument for the engine: JOINs only make sense when loading instances."""
+        return self._related if self._result_type == 'model' else ()
+
+    def only(self, *fields):
+        """
+        Selects only the given columns (plus the primary key) into partially
+        loaded instances. This is chainable. e.g., .only('id', 'name')
+        Saving such an instance only writes the columns that were loaded and changed.
+        """
+        columns = self._resolve_columns(fields)
+        pk_name = self.model_class._meta.pk_name
+        if pk_name not in columns:
+            columns = (pk_name,) + columns
+
+        new_queryset = self._clone()
+        new_queryset._result_type = 'model'
+        new_queryset._columns = columns
+        new_queryset._flat = False
+        # Instances are never grouped.
+        new_queryset._annotations = ()
+        return new_queryset
+
+    def select_related(self, *fields):
+        """
+        Loads the targets of the given ForeignKeys in the same query, with a
+        JOIN, and attaches them to each instance. This is chainable.
+        e.g., Post.objects.select_related('author') sets `post.author` to an
+        Author (or None when `author_id` is NULL) without one query per row.
+        The attached instance is not refreshed if `author_id` changes later.
+        """
+        meta = self.model_class._meta
+        related = list(self._related)
+        for name in fields:
+            if name not in meta.fk_columns:
+                if meta.column_for(name) is None:
+                    raise AttributeError(f"'{self.model_class.__name__}' object has no attribute '{name}'")
+                raise ValueError(f"select_related() expects ForeignKey names, and '{name}' is not one.")
+            if name not in related:
+                related.append(name)
+
+        new_queryset = self._clone()
+        new_queryset._related = tuple(related)
+        return new_queryset
+
+    def prefetch_related(self, *accessors):
+        """
+        Loads reverse ForeignKey sets (e.g. 'post_set' on Author) with one
+        extra query per relation and attaches them as lists. This is chainable.
+        e.g., Author.objects.prefetch_related('post_set'), then `author.post_set`.
+        """
+        reverse_relations = self.model_class._reverse_relations
+        prefetch = list(self._prefetch)
+        for accessor in accessors:
+            if accessor not in reverse_relations:
+                raise AttributeError(
+                    f"'{self.model_class.__name__}' has no reverse relation '{accessor}'. "
+                    f"Choose from: {', '.join(sorted(reverse_relations)) or 'none'}."
+                )
+            if accessor not in prefetch:
+                prefetch.append(accessor)
+
+        new_queryset = self._clone()
+        new_queryset._prefetch = tuple(prefetch)
+        return new_queryset
+
+    def values(self, *fields):
+        """
+        Makes the query return dicts of column -> value instead of instances.
+        Without arguments, every column is returned. This is chainable.
+        """
+        new_queryset = self._clone()
+        new_queryset._result_type = 'values'
+        new_queryset._columns = self._resolve_columns(fields) if fields else self._all_columns()
+        new_queryset._flat = False
+        return new_queryset
+
+    def values_list(self, *fields, flat=False):
+        """
+        Makes the query return tuples of values instead of instances, or single
+        values with `flat=True` (which needs exactly one field). This is chainable.
+        """
+        if flat and len(fields) != 1:
+            raise TypeError("values_list() with flat=True expects exactly one field.")
+
+        new_queryset = self._clone()
+        new_queryset._result_type = 'values_list'
+        new_queryset._columns = self._resolve_columns(fields) if fields else self._all_columns()
+        new_queryset._flat = flat
+        return new_queryset
+
+    def _resolve_aggregates(self, aggregates):
+        """Turns alias=Aggregate(...) keywords into (alias, function, column, distinct) tuples."""
+        columns = self.model_class._meta.column_fields
+        resolved = []
+        for alias, aggregate in aggregates.items():
+            if not isinstance(aggregate, Aggregate):
+                raise TypeError(f"'{alias}' must be an aggregate such as Sum() or Count(), got {type(aggregate).__name__}.")
+            if alias in columns:
+                raise ValueError(f"The aggregate alias '{alias}' conflicts with a column of the same name.")
+            col_name = '*' if aggregate.field == '*' else self._resolve_columns([aggregate.field])[0]
+            resolved.append((alias, aggregate.function, col_name, aggregate.distinct))
+        return tuple(resolved)
+
+    def annotate(self, **aggregates):
+        """
+        Adds aggregates computed per group of the values()/values_list()
+        columns (GROUP BY). This is chainable.
+        e.g., Post.objects.values('author_id').annotate(n=Count('id'))
+        returns [{'author_id': 1, 'n': 3}, ...]. Results can be ordered by alias.
+        """
+        if self._result_type == 'model':
+            raise TypeError("annotate() groups by the selected columns; call values() or values_list() first.")
+        if self._flat:
+            raise TypeError("annotate() cannot be combined with values_list(flat=True).")
+
+        new_queryset = self._clone()
+        new_queryset._annotations = self._annotations + self._resolve_aggregates(aggregates)
+        return new_queryset
+
+    async def aggregate(self, **aggregates):
+        """
+        Computes aggregates over all matching records in the database and
+        returns them as a dict, e.g. {'total': 1250, 'n': 42}.
+        """
+        engine = db.read_engine(self.model_class)
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        if not aggregates:
+            raise TypeError("aggregate() requires at least one aggregate.")
+        annotations = self._resolve_aggregates(aggregates)
+
+        self.validate_filters() # Validate self._filters
+        try:
+            rows = await engine.select(
+                self.model_class,
+                filters=self._filters,
+                columns=(),
+                annotations=annotations,
+                cache_ttl=self._cache_ttl
+            )
+        except QueryError as e:
+            error_msg = str(e).lower()
+            if "invalid input syntax" in error_msg:
+                raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+            raise  # Re-raise other QueryErrors
+
+        return rows[0]
+
+    def cached(self, ttl=60):
+        """
+        Serves this query's results from the engine's result cache for up to
+        `ttl` seconds. Any write to the tables it reads invalidates them at
+        once, so `ttl` only bounds staleness from writes made outside this
+        process. This is chainable. e.g., Country.objects.cached(ttl=300).all()
+        """
+        if ttl is None or ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds.")
+
+        new_queryset = self._clone()
+        new_queryset._cache_ttl = ttl
+        return new_queryset
+
+    def validate_filters(self, filters=None):
+        """
+        Validates all filters in self._filters (or the normalized `filters`
+        given) using the model's field validators.
+        Raises ValidationError if any value is invalid for its field type or
+        lookup (e.g., a string for an int, or a non-list for `__in`), and
+        AttributeError for unknown fields.
+        """
+        column_fields = self.model_class._meta.column_fields
+        if filters is None:
+            filters = self._filters
+        for key, value in filters.items():
+            col_name, lookup = split_lookup(key)
+            field = column_fields.get(col_name)
+            if field is None:
+                raise AttributeError(f"'{self.model_class.__name__}' object has no attribute '{col_name}'")
+            validate_lookup(col_name, field, lookup, value)
 
     def filter(self, **kwargs):
         """
         Adds a filter condition to the query. This is chainable.
+        Keys may end in a lookup: `__in`, `__gt`, `__gte`, `__lt`, `__lte`,
+        `__isnull` or `__startswith` (e.g., .filter(age__gte=18, id__in=[1, 2])).
         """
         # We create a clone of the current QuerySet to ensure
         # that chaining does not modify the original QuerySet.
-        new_queryset = copy.deepcopy(self)
-        new_queryset._filters.update(kwargs)
+        new_queryset = self._clone()
+        new_queryset._filter_node = (self._filter_node, self._prepare_filter_items(kwargs))
         return new_queryset
 
+    @staticmethod
+    def _prepare_filter_items(kwargs):
+        # Every clone re-reads these items, so one-shot `__in` iterables are materialized here.
+        return tuple((key, prepare_lookup_value(split_lookup(key)[1], value)) for key, value in kwargs.items())
+
     def order_by(self, *args):
         """
         Adds an ordering condition to the query. This is chainable.
         e.g., .order_by('username', '-id')
         """
-        new_queryset = copy.deepcopy(self)
-        new_queryset._ordering.extend(args)
+        new_queryset = self._clone()
+        new_queryset._ordering_node = (self._ordering_node, args)
         return new_queryset
 
     async def all(self):
         """
         Executes the query and returns all matching records as a list.
         """
-        engine = db.engine
+        engine = db.read_engine(self.model_class)
         if not engine:
             raise exceptions.ORMError("Engine is not configured.")
 
@@ -60,27 +472,73 @@ class QuerySet:
             rows = await engine.select(
                 self.model_class,
                 filters=self._filters,
-                ordering=self._ordering  # <-- Pass ordering to the engine
+                ordering=self._ordering,  # <-- Pass ordering to the engine
+                columns=self._columns,
+                related=self._query_related(),
+                annotations=self._annotations,
+                cache_ttl=self._cache_ttl
             )
         except QueryError as e:
             error_msg = str(e).lower()
             if "invalid input syntax" in error_msg:
                 raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
             raise  # Re-raise other QueryErrors
-        
-        # Convert raw data rows into model instances
-        results = []
-        for row in rows:
-            instance = self.model_class(**row)
-            instance._is_new = False # <-- THE FIX
-            results.append(instance)
+
+        results = self._hydrate(rows)
+        await self._prefetch_related(results)
         return results
 
+    async def iterator(self, chunk_size=2000):
+        """
+        Streams matching records (instances, or dicts/tuples after values()/values_list()), fetching them from a
+        server-side cursor `chunk_size` rows at a time.
+        Usage: `async for obj in Model.objects.filter(...).iterator():`
+        When breaking out early, wrap it in `contextlib.aclosing()` to release
+        the connection right away instead of when the generator is collected.
+        """
+        engine = db.read_engine(self.model_class)
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        self.validate_filters() # Validate self._filters
+        chunks = engine.iterate(
+            self.model_class,
+            filters=self._filters,
+            ordering=self._ordering,
+            chunk_size=chunk_size,
+            columns=self._columns,
+            related=self._query_related(),
+            annotations=self._annotations
+        )
+        try:
+            while True:
+                try:
+                    rows = await chunks.__anext__()
+                except StopAsyncIteration:
+                    break
+                except QueryError as e:
+                    error_msg = str(e).lower()
+                    if "invalid input syntax" in error_msg:
+                        raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+                    raise  # Re-raise other QueryErrors
+
+                # Hydrate (and prefetch) one chunk at a time so memory stays bounded.
+                results = self._hydrate(rows)
+                await self._prefetch_related(results)
+                for obj in results:
+                    yield obj
+        finally:
+            # Release the cursor and its connection even if the caller stops early.
+            await chunks.aclose()
+
     async def first(self):
         """
         Executes the query and returns the first matching record, or None.
         """
-        engine = db.engine
+        engine = db.read_engine(self.model_class)
         if not engine:
             raise exceptions.ORMError("Engine is not configured.")
 
@@ -92,7 +550,11 @@ class QuerySet:
                 self.model_class,
                 filters=self._filters,
                 ordering=self._ordering,
-                limit=1
+                limit=1,
+                columns=self._columns,
+                related=self._query_related(),
+                annotations=self._annotations,
+                cache_ttl=self._cache_ttl
             )
         except QueryError as e:
             error_msg = str(e).lower()
@@ -103,26 +565,152 @@ class QuerySet:
         if not rows:
             return None
         
-        # We need to correctly initialize the instance from the row data
-        instance = self.model_class(**rows[0])
-        instance._is_new = False
+        # We need to correctly initialize the result from the row data
+        results = self._hydrate(rows)
+        await self._prefetch_related(results)
+        return results[0]
 
-        return instance
+    def _keyset_ordering(self):
+        """
+        The ordering as column names, with the primary key appended so every
+        row has a unique sort key (e.g. ['-name'] becomes ['-name', 'id']).
+        """
+        meta = self.model_class._meta
+        ordering = []
+        for field_name in self._ordering:
+            descending = field_name.startswith('-')
+            col_name = meta.column_for(field_name.lstrip('-'))
+            if col_name is None:
+                raise AttributeError(f"'{self.model_class.__name__}' object has no attribute '{field_name.lstrip('-')}'")
+            if all(existing.lstrip('-') != col_name for existing in ordering):
+                ordering.append(f"-{col_name}" if descending else col_name)
+        if all(existing.lstrip('-') != meta.pk_name for existing in ordering):
+            ordering.append(meta.pk_name)
+        return ordering
+
+    async def paginate_after(self, cursor=None, page_size=50):
+        """
+        Returns `(results, next_cursor)` for the page that follows `cursor`
+        (None for the first page), using keyset pagination on the current
+        order_by() fields plus the primary key: `WHERE (a, id) > ($1, $2) LIMIT n`.
+        Every page costs the same, however deep. `next_cursor` is an opaque
+        token, or None after the last page. Ordering columns must not be NULL.
+        """
+        engine = db.read_engine(self.model_class)
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        if self._annotations:
+            raise TypeError("paginate_after() cannot be used with annotate().")
+
+        ordering = self._keyset_ordering()
+        after = _decode_cursor(cursor, ordering) if cursor is not None else None
+
+        # The sort key of the last row is read from the result, so it must be selected.
+        columns = self._columns
+        missing = []
+        if columns is not None:
+            missing = [field_name.lstrip('-') for field_name in ordering if field_name.lstrip('-') not in columns]
+        if missing:
+            if self._result_type != 'model':
+                raise ValueError(f"paginate_after() needs the ordering columns {missing} in values()/values_list().")
+            columns = columns + tuple(missing)
+
+        self.validate_filters() # Validate self._filters
+        try:
+            # One extra row tells whether there is a next page.
+            rows = await engine.select(
+                self.model_class,
+                filters=self._filters,
+                ordering=ordering,
+                limit=page_size + 1,
+                columns=columns,
+                related=self._query_related(),
+                after=after,
+                cache_ttl=self._cache_ttl
+            )
+        except QueryError as e:
+            error_msg = str(e).lower()
+            if "invalid input syntax" in error_msg:
+                raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+            raise  # Re-raise other QueryErrors
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = _encode_cursor(ordering, [last[field_name.lstrip('-')] for field_name in ordering])
+
+        results = self._hydrate(rows)
+        await self._prefetch_related(results)
+        return results, next_cursor
+
+    async def count(self):
+        """
+        Returns the number of matching records with `SELECT count(*)`,
+        without fetching any rows.
+        """
+        engine = db.read_engine(self.model_class)
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        self.validate_filters() # Validate self._filters
+        try:
+            return await engine.count(self.model_class, filters=self._filters)
+        except QueryError as e:
+            error_msg = str(e).lower()
+            if "invalid input syntax" in error_msg:
+                raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+            raise  # Re-raise other QueryErrors
+
+    async def exists(self):
+        """
+        Returns True if any record matches, with `SELECT 1 ... LIMIT 1`.
+        """
+        engine = db.read_engine(self.model_class)
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        self.validate_filters() # Validate self._filters
+        try:
+            return await engine.exists(self.model_class, filters=self._filters)
+        except QueryError as e:
+            error_msg = str(e).lower()
+            if "invalid input syntax" in error_msg:
+                raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+            raise  # Re-raise other QueryErrors
 
     async def get(self, **kwargs):
         """
-        Fetches exactly one record from the database.
+        Fetches exactly one record from the database: an instance, or a
+        dict/tuple/value after values()/values_list(), like first().
         """
         # We fetch the engine from the model class dynamically,
         # ensuring we get the configured engine after setup() has run.
-        engine = db.engine
+        engine = db.read_engine(self.model_class)
         if not engine:
             raise exceptions.ORMError("Engine is not configured.")
 
 
-        self.validate_filters() # Validate kwargs (set self._filters if needed)
+        kwargs = {self._filter_key(key): value for key, value in self._prepare_filter_items(kwargs)}
+        self.validate_filters(kwargs)
+
+        # Inside a session, a lookup by primary key of an already loaded row
+        # needs no query at all.
+        session = current_session()
+        pk_name = self.model_class._meta.pk_name
+        if session is not None and self._result_type == 'model' and list(kwargs) == [pk_name] \
+                and not self._prefetch:
+            instance = session.get(self.model_class, kwargs[pk_name])
+            if instance is not None and all(hasattr(instance, name) for name in self._related):
+                return instance
+
         try:
-            rows = await engine.select(self.model_class, filters=kwargs)
+            rows = await engine.select(self.model_class, filters=kwargs, columns=self._columns,
+                                       related=self._query_related(), annotations=self._annotations,
+                                       cache_ttl=self._cache_ttl)
         except QueryError as e:
             error_msg = str(e).lower()
             if "invalid input syntax" in error_msg:
@@ -135,10 +723,82 @@ class QuerySet:
         if len(rows) > 1:
             raise exceptions.MultipleObjectsReturned(f"Query returned {len(rows)} objects, but expected 1.")
         
-        instance = self.model_class(**rows[0])
-        instance._is_new = False
-        instance._set_original_pk()  # Set original PK after load
-        return instance
+        # Build the result straight from the row (instances are marked as persisted)
+        results = self._hydrate(rows)
+        await self._prefetch_related(results)
+        return results[0]
+
+    async def update(self, returning=None, **kwargs):
+        """
+        Updates every matching record with one `UPDATE ... WHERE` and returns
+        the number of rows changed. With `returning=['id', ...]`, returns the
+        changed rows' columns as dicts instead, without a second query.
+        Loaded instances are not refreshed.
+        """
+        engine = db.engine
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        if not kwargs:
+            raise ValueError("update() requires at least one field.")
+
+        meta = self.model_class._meta
+        updates = {}
+        for name, value in kwargs.items():
+            col_name = self._resolve_columns([name])[0]
+            field = meta.column_fields[col_name]
+            if value is None:
+                if field.required:
+                    raise exceptions.ValidationError(f"Field '{name}' is required and cannot be null.")
+            else:
+                field.validate(value)
+            updates[col_name] = value
+
+        self.validate_filters() # Validate self._filters
+        try:
+            result = await engine.update_where(
+                self.model_class, self._filters, updates,
+                returning=self._resolve_columns(returning) if returning else None
+            )
+        except QueryError as e:
+            error_msg = str(e).lower()
+            if "invalid input syntax" in error_msg:
+                raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+            raise  # Re-raise other QueryErrors
+
+        # The session's instances of these rows no longer match the database.
+        session = current_session()
+        if session is not None:
+            session.evict(self.model_class)
+        return result
+
+    async def delete(self, returning=None):
+        """
+        Deletes every matching record with one `DELETE ... WHERE` and returns
+        the number of rows removed. With `returning=['id', ...]`, returns the
+        deleted rows' columns as dicts instead.
+        """
+        engine = db.engine
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        self.validate_filters() # Validate self._filters
+        try:
+            result = await engine.delete_where(
+                self.model_class, self._filters,
+                returning=self._resolve_columns(returning) if returning else None
+            )
+        except QueryError as e:
+            error_msg = str(e).lower()
+            if "invalid input syntax" in error_msg:
+                raise exceptions.ValidationError(f"Invalid input for query: {str(e)}")
+            raise  # Re-raise other QueryErrors
+
+        # Deleted rows (and rows changed by cascades) must not be served from the session.
+        session = current_session()
+        if session is not None:
+            session.evict(self.model_class)
+        return result
 
     async def create(self, **kwargs):
         """
@@ -149,5 +809,81 @@ class QuerySet:
         instance = self.model_class(**kwargs)
         # Use the instance's own save method to persist it
         await instance.save()
-        instance._set_original_pk()  # Set original PK after load
         return instance
+
+    async def bulk_create(self, instances, batch_size=None):
+        """
+        Inserts many new instances using multi-row INSERT statements and returns them.
+        Each instance is validated once, and generated primary keys are set on them.
+        """
+        engine = db.engine
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        instances = list(instances)
+        for instance in instances:
+            if not isinstance(instance, self.model_class):
+                raise TypeError(f"bulk_create() expected {self.model_class.__name__} instances, got {type(instance).__name__}.")
+            if not instance._is_new:
+                raise exceptions.ORMError("bulk_create() can only insert new instances.")
+            instance.validate()
+
+        await engine.bulk_insert(self.model_class, instances, batch_size=batch_size)
+
+        session = current_session()
+        for instance in instances:
+            instance._mark_persisted()
+            if session is not None:
+                session.add(instance)
+        return instances
+
+    async def copy_from(self, records, format='text', include_pk=False):
+        """
+        Streams records (instances or dicts, sync or async iterable) into the
+        table with PostgreSQL's COPY protocol and returns the number of rows loaded.
+        Unlike `bulk_create()`, no instances are returned and no PKs are set.
+        """
+        engine = db.engine
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        return await engine.copy_records(self.model_class, records, format=format, include_pk=include_pk)
+
+    async def bulk_update(self, instances, fields, batch_size=None):
+        """
+        Writes the given fields of many loaded instances in batched
+        `UPDATE ... FROM (VALUES ...)` statements. Returns the affected row count.
+        """
+        engine = db.engine
+        if not engine:
+            raise exceptions.ORMError("Engine is not configured.")
+
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        pk_name = self.model_class._meta.pk_name
+
+        # Accept both 'author' and 'author_id' for foreign keys.
+        if pk_name in [self.model_class._meta.column_for(name) for name in fields]:
+            raise ValueError("bulk_update() cannot be used to change the primary key.")
+        field_names = self._resolve_columns(fields)
+        if not field_names:
+            raise ValueError("bulk_update() requires at least one field.")
+
+        instances = list(instances)
+        for instance in instances:
+            if not isinstance(instance, self.model_class):
+                raise TypeError(f"bulk_update() expected {self.model_class.__name__} instances, got {type(instance).__name__}.")
+            if instance._is_new or getattr(instance, pk_name, None) is None:
+                raise exceptions.ORMError("bulk_update() can only update saved instances.")
+            if getattr(instance, '_original_pk_value', None) is not None and getattr(instance, pk_name) != instance._original_pk_value:
+                raise exceptions.ValidationError(f"Primary key '{pk_name}' cannot be changed.")
+            instance.validate()
+
+        affected = await engine.bulk_update(self.model_class, instances, field_names, batch_size=batch_size)
+        for instance in instances:
+            instance._refresh_snapshot(field_names)
+        return affected
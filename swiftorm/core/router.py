@@ -0,0 +1,81 @@
+"""
+Routes reads to read replicas and writes to the primary database.
+
+    DATABASES = {'default': {...}, 'replica_1': {...}, 'replica_2': {...}}
+    DATABASE_ROUTER = {
+        'replicas': ['replica_1', 'replica_2'],
+        'strategy': 'round_robin',    # or 'least_loaded'
+        'sticky_seconds': 2.0,
+    }
+
+After a write, the context that made it (the current task and the tasks it
+starts) keeps reading from the primary for `sticky_seconds`, so it always
+sees its own writes even while the replicas lag behind.
+"""
+import contextvars
+import time
+
+
+STRATEGIES = ('round_robin', 'least_loaded')
+
+# time.monotonic() of the last write made in the current context.
+_last_write = contextvars.ContextVar('swiftorm_last_write', default=None)
+
+
+class Router:
+    """Picks the engine each query runs on."""
+    def __init__(self, primary, replicas=(), strategy='round_robin', sticky_seconds=2.0):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown router strategy '{strategy}'; expected one of {', '.join(STRATEGIES)}.")
+        if sticky_seconds < 0:
+            raise ValueError("sticky_seconds cannot be negative.")
+
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self._next = 0
+
+        # Counters exposed through `stats()`.
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self.sticky_reads = 0
+
+    def record_write(self, model_class=None):
+        """Starts the read-your-writes window of the current context."""
+        _last_write.set(time.monotonic())
+
+    def db_for_read(self, model_class):
+        """
+        Returns a replica, unless the current task is in a transaction (or holds
+        a primary connection for any other reason) or wrote recently.
+        """
+        if not self.replicas or self.primary.pool.current_connection() is not None:
+            self.primary_reads += 1
+            return self.primary
+
+        last_write = _last_write.get()
+        if last_write is not None and time.monotonic() - last_write < self.sticky_seconds:
+            self.sticky_reads += 1
+            return self.primary
+
+        self.replica_reads += 1
+        if self.strategy == 'least_loaded':
+            return min(self.replicas, key=_load)
+        replica = self.replicas[self._next % len(self.replicas)]
+        self._next += 1
+        return replica
+
+    def stats(self):
+        return {
+            'replicas': len(self.replicas),
+            'primary_reads': self.primary_reads,
+            'replica_reads': self.replica_reads,
+            'sticky_reads': self.sticky_reads,
+        }
+
+
+def _load(engine):
+    # Connections busy or being waited for; ties go to the first replica listed.
+    stats = engine.pool.stats()
+    return stats['in_use'] + stats['waiting']
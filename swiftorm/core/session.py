@@ -0,0 +1,93 @@
+"""
+An opt-in identity map, scoped to the current async context.
+
+    async with swiftorm.session():
+        a = await Author.objects.get(id=1)
+        b = await Author.objects.get(id=1)   # no query, and `b is a`
+
+Inside a session, every persisted instance is loaded once per (model, primary
+key): later queries returning the same row resolve to the existing object,
+which keeps its in-memory state (including unsaved changes).
+"""
+import contextvars
+from contextlib import asynccontextmanager
+
+
+_current_session = contextvars.ContextVar('swiftorm_session', default=None)
+
+
+def current_session():
+    """Returns the active Session, or None outside `session()`."""
+    return _current_session.get()
+
+
+class Session:
+    """Maps (model class, primary key) to the one loaded instance of that row."""
+    def __init__(self):
+        self._identity = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._identity)
+
+    def get(self, model_class, pk_value):
+        """Returns the loaded instance for a primary key, or None."""
+        instance = self._identity.get((model_class, pk_value))
+        if instance is not None:
+            self.hits += 1
+        return instance
+
+    def add(self, instance):
+        """
+        Registers a persisted instance and returns the canonical one: the
+        instance already registered for the same row wins.
+        """
+        pk_value = getattr(instance, instance._meta.pk_name, None)
+        if pk_value is None:
+            return instance
+        return self._identity.setdefault((type(instance), pk_value), instance)
+
+    def discard(self, instance):
+        """Forgets an instance (e.g. after it was deleted)."""
+        pk_value = getattr(instance, instance._meta.pk_name, None)
+        if self._identity.get((type(instance), pk_value)) is instance:
+            del self._identity[(type(instance), pk_value)]
+
+    def evict(self, model_class):
+        """
+        Forgets every instance of `model_class`, and of the models referencing
+        it, whose rows a set-based write or a cascade may have changed.
+        """
+        models = set()
+        pending = [model_class]
+        while pending:
+            model = pending.pop()
+            if model in models:
+                continue
+            models.add(model)
+            pending.extend(relation.model_class for relation in model._reverse_relations.values())
+        for key in [key for key in self._identity if key[0] in models]:
+            del self._identity[key]
+
+    def clear(self):
+        self._identity.clear()
+
+
+@asynccontextmanager
+async def session():
+    """
+    Opens an identity map for the current async context (and the tasks it
+    starts). Nested `session()` blocks share the outer one.
+    """
+    active = _current_session.get()
+    if active is not None:
+        yield active
+        return
+
+    new_session = Session()
+    token = _current_session.set(new_session)
+    try:
+        yield new_session
+    finally:
+        _current_session.reset(token)
+        new_session.clear()
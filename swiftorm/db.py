@@ -1,2 +1,15 @@
-# This module holds the single, configured engine instance for the application.
-engine = None
\ No newline at end of file
+# This module holds the configured engines for the application.
+# `engine` is the primary ('default') database, which receives every write.
+engine = None
+
+# Every configured database by name, and the router sending reads to the
+# replicas (None when there are no replicas).
+engines = {}
+router = None
+
+
+def read_engine(model_class):
+    """Returns the engine a read of `model_class` should run on."""
+    if router is None:
+        return engine
+    return router.db_for_read(model_class)
@@ -0,0 +1,98 @@
+import pytest
+from examples.blog.models import Author, Post, Product
+from swiftorm.core import exceptions
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_assigns_generated_pks(db_session):
+    """
+    Tests that bulk_create inserts every instance and sets the SERIAL PKs
+    back onto them in order.
+    """
+    authors = [Author(name=f'Author {i}') for i in range(25)]
+    created = await Author.objects.bulk_create(authors, batch_size=10)
+
+    assert created == authors
+    ids = [a.id for a in authors]
+    assert None not in ids
+    assert len(set(ids)) == 25
+
+    fetched = await Author.objects.get(id=authors[7].id)
+    assert fetched.name == 'Author 7'
+
+    # The instances are now persisted, so saving them issues an UPDATE.
+    assert all(not a._is_new for a in authors)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_with_text_pk_and_foreign_keys(db_session):
+    """
+    Tests bulk_create on a model with a non-SERIAL PK and on a model with a ForeignKey.
+    """
+    await Product.objects.bulk_create([
+        Product(sku='A-1', name='First', price='1$'),
+        Product(sku='A-2', name='Second', price='2$'),
+    ])
+    assert (await Product.objects.get(sku='A-2')).name == 'Second'
+
+    author = await Author.objects.create(name='Behzad')
+    posts = await Post.objects.bulk_create([Post(title=f'Post {i}', author_id=author.id) for i in range(3)])
+    assert len(await Post.objects.filter(author_id=author.id).all()) == 3
+    assert all(p.id is not None for p in posts)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_validates_and_maps_integrity_errors(db_session):
+    """
+    Tests that invalid instances are rejected before any SQL runs and that
+    unique violations surface as IntegrityError.
+    """
+    with pytest.raises(exceptions.ValidationError):
+        await Author.objects.bulk_create([Author(name='ok'), Author()])
+
+    with pytest.raises(exceptions.IntegrityError):
+        await Product.objects.bulk_create([
+            Product(sku='DUP', name='One', price='1$'),
+            Product(sku='DUP', name='Two', price='2$'),
+        ])
+
+
+@pytest.mark.asyncio
+async def test_copy_from_streams_a_generator(db_session):
+    """
+    Tests that copy_from loads rows from a generator and reports the row count.
+    """
+    def generate():
+        for i in range(500):
+            yield {'name': f'Copied {i}'}
+
+    loaded = await Author.objects.copy_from(generate())
+    assert loaded == 500
+    assert len(await Author.objects.all()) == 500
+
+    loaded = await Author.objects.copy_from([Author(name='Binary')], format='binary')
+    assert loaded == 1
+    assert (await Author.objects.get(name='Binary')).id is not None
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_writes_selected_fields(db_session):
+    """
+    Tests that bulk_update changes only the listed fields and returns the
+    number of affected rows.
+    """
+    authors = await Author.objects.bulk_create([Author(name=f'Old {i}') for i in range(12)])
+    for author in authors:
+        author.name = author.name.replace('Old', 'New')
+
+    affected = await Author.objects.bulk_update(authors, fields=['name'], batch_size=5)
+    assert affected == 12
+
+    names = sorted(a.name for a in await Author.objects.all())
+    assert names == sorted(f'New {i}' for i in range(12))
+
+    with pytest.raises(ValueError):
+        await Author.objects.bulk_update(authors, fields=['id'])
+
+    with pytest.raises(exceptions.ORMError):
+        await Author.objects.bulk_update([Author(name='unsaved')], fields=['name'])
@@ -43,4 +43,23 @@ async def test_full_crud_cycle(field, db_session):
     
     # Verify the deletion by trying to fetch it again
     with pytest.raises(exceptions.ObjectNotFound):
-        await Author.objects.get(id=author_id)
\ No newline at end of file
+        await Author.objects.get(id=author_id)
+
+@pytest.mark.asyncio
+async def test_save_writes_only_changed_columns(db_session):
+    """
+    Tests that saving an unchanged instance is a no-op and that a partial
+    change does not overwrite columns modified elsewhere.
+    """
+    author = await Author.objects.create(name='Behzad')
+
+    # Another copy changes the row behind our back.
+    other = await Author.objects.get(id=author.id)
+    other.name = 'Changed elsewhere'
+    await other.save()
+
+    # Our instance is unchanged, so save() must not write its stale name.
+    await author.save()
+    assert (await Author.objects.get(id=author.id)).name == 'Changed elsewhere'
+
+    await author.delete()
@@ -1,6 +1,8 @@
 import pytest
-from examples.blog.models import Author
+import swiftorm
+from examples.blog.models import Author, Post
 from swiftorm.core import exceptions
+from swiftorm.core.aggregates import Count, Max
 
 
 @pytest.mark.parametrize("field", ["name"])
@@ -74,4 +76,236 @@ async def test_get_exceptions(field, db_session):
     # Clean up
     authors = await Author.objects.all()
     for author in authors:
-        await author.delete()
\ No newline at end of file
+        await author.delete()
+
+@pytest.mark.asyncio
+async def test_iterator_streams_in_chunks(db_session):
+    """
+    Tests that iterator() yields every matching record, in order, across
+    several cursor fetches, and returns the connection to the pool.
+    """
+    await Author.objects.bulk_create([Author(name=f'Author {i:02d}') for i in range(25)])
+
+    names = []
+    async for author in Author.objects.order_by('name').iterator(chunk_size=10):
+        assert isinstance(author, Author)
+        assert author._is_new is False
+        names.append(author.name)
+
+    assert names == [f'Author {i:02d}' for i in range(25)]
+
+    assert swiftorm.db.engine.pool.stats()['in_use'] == 0
+
+
+@pytest.mark.asyncio
+async def test_projections(db_session):
+    """
+    Tests only(), values() and values_list() against the database.
+    """
+    await Author.objects.create(name='Barad')
+    await Author.objects.create(name='Behzad')
+
+    names = await Author.objects.order_by('name').values_list('name', flat=True).all()
+    assert names == ['Barad', 'Behzad']
+
+    rows = await Author.objects.filter(name='Behzad').values('name').all()
+    assert rows == [{'name': 'Behzad'}]
+
+    pairs = await Author.objects.order_by('name').values_list('id', 'name').all()
+    assert [name for _, name in pairs] == ['Barad', 'Behzad']
+
+    author = await Author.objects.only('id').filter(name='Barad').first()
+    assert author.id == pairs[0][0]
+    assert not hasattr(author, 'name')
+
+    # Saving a partially loaded instance must not clear the unloaded column.
+    await author.save()
+    assert (await Author.objects.get(id=author.id)).name == 'Barad'
+
+
+@pytest.mark.asyncio
+async def test_select_related(db_session):
+    """
+    Tests that select_related() loads ForeignKey targets in the same query.
+    """
+
+    barad = await Author.objects.create(name='Barad')
+    behzad = await Author.objects.create(name='Behzad')
+    await Post.objects.create(title='First', author_id=barad.id)
+    await Post.objects.create(title='Second', author_id=barad.id)
+    await Post.objects.create(title='Third', author_id=behzad.id)
+
+    posts = await Post.objects.select_related('author').order_by('id').all()
+    assert [post.author.name for post in posts] == ['Barad', 'Barad', 'Behzad']
+    assert posts[0].author is posts[1].author
+
+    post = await Post.objects.select_related('author').filter(title='Third').first()
+    assert post.author.id == behzad.id
+
+    post = await Post.objects.select_related('author').get(title='Second')
+    assert post.author.name == 'Barad'
+
+    # Saving the post only writes its own columns.
+    post.title = 'Renamed'
+    await post.save()
+    assert (await Post.objects.get(id=post.id)).title == 'Renamed'
+
+
+@pytest.mark.asyncio
+async def test_prefetch_related(db_session):
+    """
+    Tests that prefetch_related() loads reverse ForeignKey sets with one extra query.
+    """
+
+    barad = await Author.objects.create(name='Barad')
+    await Author.objects.create(name='Behzad')
+    await Post.objects.create(title='First', author_id=barad.id)
+    await Post.objects.create(title='Second', author_id=barad.id)
+
+    authors = await Author.objects.prefetch_related('post_set').order_by('name').all()
+    assert [[post.title for post in author.post_set] for author in authors] == [['First', 'Second'], []]
+    assert authors[0].post_set[0].author is authors[0]
+
+    author = await Author.objects.prefetch_related('post_set').get(name='Barad')
+    assert len(author.post_set) == 2
+
+
+@pytest.mark.asyncio
+async def test_filter_lookups(db_session):
+    """
+    Tests that lookup suffixes are evaluated by the database.
+    """
+    ids = [(await Author.objects.create(name=name)).id for name in ('Barad', 'Behzad', 'Cyrus')]
+
+    assert len(await Author.objects.filter(id__in=ids[:2]).all()) == 2
+    assert len(await Author.objects.filter(id__in=[]).all()) == 0
+    assert [a.name for a in await Author.objects.filter(id__gt=ids[0]).order_by('id').all()] == ['Behzad', 'Cyrus']
+    assert len(await Author.objects.filter(id__gte=ids[0], id__lt=ids[2]).all()) == 2
+    assert [a.name for a in await Author.objects.filter(name__startswith='Be').all()] == ['Behzad']
+    assert len(await Author.objects.filter(name__startswith='%').all()) == 0
+    assert len(await Author.objects.filter(name__isnull=False).all()) == 3
+
+    with pytest.raises(exceptions.ValidationError):
+        await Author.objects.filter(id__in='1,2').all()
+
+
+@pytest.mark.asyncio
+async def test_count_and_exists(db_session):
+    """
+    Tests that count() and exists() are answered by the database and honor filters.
+    """
+    assert await Author.objects.count() == 0
+    assert await Author.objects.exists() is False
+
+    await Author.objects.create(name='Barad')
+    await Author.objects.create(name='Barad')
+    await Author.objects.create(name='Behzad')
+
+    assert await Author.objects.count() == 3
+    assert await Author.objects.filter(name='Barad').count() == 2
+    assert await Author.objects.filter(name='Cyrus').exists() is False
+    assert await Author.objects.filter(name__startswith='Be').exists() is True
+
+
+@pytest.mark.asyncio
+async def test_aggregate_and_annotate(db_session):
+    """
+    Tests that aggregates and GROUP BY are computed by the database.
+    """
+
+    barad = await Author.objects.create(name='Barad')
+    behzad = await Author.objects.create(name='Behzad')
+    for title in ('a', 'b', 'c'):
+        await Post.objects.create(title=title, author_id=barad.id)
+    await Post.objects.create(title='d', author_id=behzad.id)
+
+    assert await Post.objects.aggregate(n=Count(), authors=Count('author', distinct=True)) == {'n': 4, 'authors': 2}
+    assert (await Post.objects.filter(author_id=behzad.id).aggregate(last=Max('title'))) == {'last': 'd'}
+
+    per_author = await Post.objects.values('author').annotate(n=Count('id')).order_by('-n').all()
+    assert per_author == [{'author_id': barad.id, 'n': 3}, {'author_id': behzad.id, 'n': 1}]
+
+
+@pytest.mark.asyncio
+async def test_set_based_update_and_delete(db_session):
+    """
+    Tests QuerySet.update() and QuerySet.delete() against the database.
+    """
+    for name in ('Barad', 'Barad', 'Behzad'):
+        await Author.objects.create(name=name)
+
+    assert await Author.objects.filter(name='Barad').update(name='Cyrus') == 2
+    assert await Author.objects.filter(name='Cyrus').count() == 2
+
+    rows = await Author.objects.filter(name='Behzad').update(name='Darius', returning=['name'])
+    assert rows == [{'name': 'Darius'}]
+
+    with pytest.raises(exceptions.ValidationError):
+        await Author.objects.update(name=None)
+
+    deleted = await Author.objects.filter(name='Cyrus').delete(returning=['name'])
+    assert deleted == [{'name': 'Cyrus'}, {'name': 'Cyrus'}]
+    assert await Author.objects.delete() == 1
+    assert await Author.objects.exists() is False
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination(db_session):
+    """
+    Tests that paginate_after() walks every row exactly once, page by page.
+    """
+    for name in ('Cyrus', 'Barad', 'Behzad', 'Barad', 'Darius'):
+        await Author.objects.create(name=name)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        page, cursor = await Author.objects.order_by('name').paginate_after(cursor, page_size=2)
+        seen.extend(author.name for author in page)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == ['Barad', 'Barad', 'Behzad', 'Cyrus', 'Darius']
+
+    rows, cursor = await Author.objects.order_by('-name').values('id', 'name').paginate_after(page_size=10)
+    assert cursor is None
+    assert [row['name'] for row in rows] == ['Darius', 'Cyrus', 'Behzad', 'Barad', 'Barad']
+
+
+@pytest.mark.asyncio
+async def test_cached_queries_are_invalidated_by_writes(db_session):
+    """
+    Tests that cached() results are served from the cache until the table is written to.
+    """
+    engine = swiftorm.db.engine
+    await Author.objects.create(name='Barad')
+
+    assert len(await Author.objects.cached(ttl=60).all()) == 1
+    hits = engine.result_cache_stats()['hits']
+    assert len(await Author.objects.cached(ttl=60).all()) == 1
+    assert engine.result_cache_stats()['hits'] == hits + 1
+
+    await Author.objects.create(name='Behzad')
+    assert len(await Author.objects.cached(ttl=60).all()) == 2
+
+    await Author.objects.filter(name='Behzad').delete()
+    assert [a.name for a in await Author.objects.cached(ttl=60).all()] == ['Barad']
+
+
+@pytest.mark.asyncio
+async def test_identity_map_session(db_session):
+    """
+    Tests that a session resolves every row to a single instance.
+    """
+    created = await Author.objects.create(name='Barad')
+
+    async with swiftorm.session():
+        first = await Author.objects.get(id=created.id)
+        listed = await Author.objects.filter(name='Barad').all()
+        assert listed[0] is first
+        assert await Author.objects.get(pk=created.id) is first
+
+    assert (await Author.objects.get(id=created.id)) is not first
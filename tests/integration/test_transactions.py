@@ -0,0 +1,33 @@
+import pytest
+import swiftorm
+from examples.blog.models import Author
+
+
+@pytest.mark.asyncio
+async def test_atomic_commits_and_rolls_back(db_session):
+    """
+    Tests that atomic() commits on success, rolls back on error and
+    undoes only the inner block when a savepoint fails.
+    """
+    async with swiftorm.atomic():
+        await Author.objects.create(name='Barad')
+        await Author.objects.create(name='Behzad')
+    assert await Author.objects.count() == 2
+
+    with pytest.raises(RuntimeError):
+        async with swiftorm.atomic():
+            await Author.objects.create(name='Cyrus')
+            raise RuntimeError("roll back")
+    assert await Author.objects.filter(name='Cyrus').exists() is False
+
+    async with swiftorm.atomic():
+        await Author.objects.create(name='Darius')
+        with pytest.raises(RuntimeError):
+            async with swiftorm.atomic():
+                await Author.objects.filter(name='Barad').delete()
+                raise RuntimeError("undo the delete only")
+        # Streaming inside a transaction must not end it.
+        names = [author.name async for author in Author.objects.order_by('name').iterator(chunk_size=1)]
+        assert names == ['Barad', 'Behzad', 'Darius']
+
+    assert await Author.objects.count() == 3
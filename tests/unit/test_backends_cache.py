@@ -0,0 +1,78 @@
+from swiftorm.backends.cache import LRUCache, ResultCache, estimate_size
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+
+    # Touch 'a' so that 'b' becomes the oldest entry.
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 1, 'misses': 0, 'evictions': 1}
+
+
+def test_lru_cache_counts_misses():
+    cache = LRUCache(maxsize=1)
+    assert cache.get('missing') is None
+    assert cache.get('missing', 'default') == 'default'
+    assert cache.misses == 2
+
+
+def test_lru_cache_with_zero_size_stores_nothing():
+    cache = LRUCache(maxsize=0)
+    cache.put('a', 1)
+    assert len(cache) == 0
+
+
+def test_result_cache_returns_copies_and_expires():
+    cache = ResultCache()
+    key = cache.key(('books',), 'SELECT 1;', [[1, 2]])
+    cache.put(key, [{'id': 1}], ttl=60)
+
+    rows = cache.get(key)
+    assert rows == [{'id': 1}]
+    rows[0]['id'] = 99
+    assert cache.get(key) == [{'id': 1}]
+
+    cache.put(key, [{'id': 1}], ttl=0)
+    assert cache.get(key) is None
+    assert cache.stats()['expirations'] == 1
+    assert cache.bytes == 0
+
+
+def test_result_cache_invalidates_by_table_version():
+    cache = ResultCache()
+    books = cache.key(('books', 'authors'), 'SELECT 1;', [])
+    stale = cache.key(('books',), 'SELECT 2;', [])
+    other = cache.key(('shelves',), 'SELECT 3;', [])
+    cache.put(books, [{'id': 1}], ttl=60)
+    cache.put(other, [{'id': 3}], ttl=60)
+
+    cache.invalidate('authors')
+    assert len(cache) == 1
+    assert cache.get(other) == [{'id': 3}]
+    # A result keyed before the write is never served after it.
+    cache.put(stale, [{'id': 2}], ttl=60)
+    cache.invalidate('books')
+    assert cache.get(cache.key(('books',), 'SELECT 2;', [])) is None
+
+
+def test_result_cache_is_bounded_in_bytes():
+    rows = [{'id': 1, 'title': 'x' * 100}]
+    cache = ResultCache()
+    cache.put(cache.key(('books',), 'SELECT 0;', []), rows, ttl=60)
+    assert cache.bytes >= estimate_size([]) + len('x' * 100)
+    # Room for exactly two such results.
+    cache.max_bytes = cache.bytes * 2
+    for i in range(1, 3):
+        cache.put(cache.key(('books',), f'SELECT {i};', []), rows, ttl=60)
+
+    assert len(cache) == 2
+    assert cache.bytes <= cache.max_bytes
+    assert cache.stats()['evictions'] == 1
+    assert cache.get(cache.key(('books',), 'SELECT 0;', [])) is None
+    assert cache.get(cache.key(('books',), 'SELECT 2;', [])) == rows
@@ -0,0 +1,78 @@
+import struct
+import pytest
+from swiftorm.backends import pgcopy
+from swiftorm.core import exceptions
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField, BooleanField, ForeignKey
+
+
+class CopyAuthor(Model):
+    id = IntegerField(primary_key=True)
+    name = TextField(required=True)
+    active = BooleanField()
+
+
+class CopyPost(Model):
+    id = IntegerField(primary_key=True)
+    title = TextField()
+    author = ForeignKey(to=CopyAuthor)
+
+
+async def _encode(model_class, records, format='text', chunk_size=pgcopy.CHUNK_SIZE):
+    columns = pgcopy.copy_columns(model_class)
+    encoder = pgcopy.CopyEncoder(pgcopy.iter_rows(model_class, records, columns), columns,
+                                 format=format, chunk_size=chunk_size)
+    chunks = [chunk async for chunk in encoder.chunks()]
+    return encoder, chunks
+
+
+def test_copy_columns_skip_serial_pk_and_use_fk_column_names():
+    assert [c for c, _ in pgcopy.copy_columns(CopyPost)] == ['title', 'author_id']
+    assert [c for c, _ in pgcopy.copy_columns(CopyPost, include_pk=True)] == ['id', 'title', 'author_id']
+    assert pgcopy.copy_statement('posts', pgcopy.copy_columns(CopyPost)) == \
+        'COPY "posts" ("title", "author_id") FROM STDIN;'
+
+
+@pytest.mark.asyncio
+async def test_text_format_escapes_special_characters_and_nulls():
+    records = [
+        CopyAuthor(name='tab\there', active=True),
+        {'name': 'back\\slash\nnewline'},
+    ]
+    encoder, chunks = await _encode(CopyAuthor, records)
+
+    assert encoder.row_count == 2
+    assert b''.join(chunks) == b'tab\\there\tt\nback\\\\slash\\nnewline\tf\n'
+
+
+@pytest.mark.asyncio
+async def test_binary_format_layout():
+    encoder, chunks = await _encode(CopyPost, [{'title': None, 'author_id': 7}], format='binary')
+    data = b''.join(chunks)
+
+    assert data.startswith(pgcopy.BINARY_HEADER)
+    assert data.endswith(pgcopy.BINARY_TRAILER)
+    body = data[len(pgcopy.BINARY_HEADER):-len(pgcopy.BINARY_TRAILER)]
+    assert body == struct.pack('!h', 2) + struct.pack('!i', -1) + struct.pack('!ii', 4, 7)
+
+
+@pytest.mark.asyncio
+async def test_rows_are_encoded_incrementally_from_a_generator():
+    def generate():
+        for i in range(1000):
+            yield {'name': f'author-{i}'}
+
+    encoder, chunks = await _encode(CopyAuthor, generate(), chunk_size=1024)
+
+    assert encoder.row_count == 1000
+    assert len(chunks) > 1
+    assert all(len(chunk) < 1024 + 64 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_invalid_records_are_rejected():
+    with pytest.raises(exceptions.ValidationError):
+        await _encode(CopyAuthor, [{'active': True}])
+
+    with pytest.raises(AttributeError, match="has no attribute 'is_admin'"):
+        await _encode(CopyAuthor, [{'name': 'x', 'is_admin': True}])
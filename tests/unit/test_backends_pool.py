@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from swiftorm.backends.pool import ConnectionPool
+from swiftorm.core import exceptions
+
+
+class FakeConnection:
+    """A minimal driver stand-in that records the statements it runs."""
+    def __init__(self, config):
+        self.config = config
+        self.connected = False
+        self.executed = []
+
+    async def connect(self):
+        self.connected = True
+
+    async def close(self):
+        self.connected = False
+
+    async def execute(self, sql, values):
+        # Yield to the event loop so concurrent tasks really overlap.
+        await asyncio.sleep(0)
+        self.executed.append(sql)
+        return [{'conn': id(self)}]
+
+
+@pytest.mark.asyncio
+async def test_pool_opens_min_size_connections():
+    pool = ConnectionPool({}, FakeConnection, min_size=2, max_size=5)
+    await pool.open()
+
+    stats = pool.stats()
+    assert stats['size'] == 2
+    assert stats['idle'] == 2
+    assert stats['in_use'] == 0
+
+    await pool.close()
+    assert pool.stats()['size'] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_use_separate_connections():
+    pool = ConnectionPool({}, FakeConnection, min_size=0, max_size=4)
+    await pool.open()
+
+    results = await asyncio.gather(*(pool.execute("SELECT 1;", []) for _ in range(4)))
+    used = {rows[0]['conn'] for rows in results}
+
+    assert len(used) == 4
+    assert pool.stats()['size'] == 4
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_nested_checkout_in_same_task_reuses_connection():
+    pool = ConnectionPool({}, FakeConnection, min_size=0, max_size=2)
+    await pool.open()
+
+    async with pool.connection() as outer:
+        async with pool.connection() as inner:
+            assert inner is outer
+        assert pool.stats()['in_use'] == 1
+
+    assert pool.stats()['in_use'] == 0
+    assert pool.stats()['idle'] == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_acquire_times_out_when_pool_is_exhausted():
+    pool = ConnectionPool({}, FakeConnection, min_size=0, max_size=1, acquire_timeout=0.05)
+    await pool.open()
+
+    conn = await pool.acquire()
+    with pytest.raises(exceptions.PoolTimeoutError):
+        await pool.acquire()
+    assert pool.stats()['timeouts'] == 1
+
+    await pool.release(conn)
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_reap_idle_keeps_min_size():
+    pool = ConnectionPool({}, FakeConnection, min_size=1, max_size=3, max_idle_time=0)
+    await pool.open()
+
+    await asyncio.gather(*(pool.execute("SELECT 1;", []) for _ in range(3)))
+    assert pool.stats()['idle'] == 3
+
+    await pool.reap_idle()
+    stats = pool.stats()
+    assert stats['size'] == 1
+    assert stats['reaped'] == 2
+    await pool.close()
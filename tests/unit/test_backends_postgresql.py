@@ -0,0 +1,420 @@
+import asyncio
+
+import pytest
+from async_driver.exceptions import QueryError
+from swiftorm.backends import postgresql
+from swiftorm.backends.postgresql import PostgresEngine
+from swiftorm.backends.pool import ConnectionPool
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField, ForeignKey
+
+
+class Book(Model):
+    __tablename__ = 'books'
+    id = IntegerField(primary_key=True)
+    title = TextField()
+
+
+def make_engine(**options):
+    # The pool only opens connections on `connect()`, so no database is needed here.
+    return PostgresEngine({'user': 'u', 'password': 'p', 'database': 'd', 'host': 'h', 'port': 5432, **options})
+
+
+def test_select_sql_depends_only_on_query_shape():
+    sql = PostgresEngine._build_select_sql('books', {'title': 'x', 'id': 1}, ['-id'], True)
+    assert sql == 'SELECT * FROM "books" WHERE "title" = $1 AND "id" = $2 ORDER BY "id" DESC LIMIT $3;'
+
+
+def test_select_related_sql_joins_and_aliases_the_related_table():
+    joins = (('author', 'authors', 'id', 'author_id', ('id', 'name')),)
+    sql = PostgresEngine._build_select_sql('posts', {'title': 'x'}, ['-id'], False, joins=joins)
+    assert sql == (
+        'SELECT "t".*, "t_author"."id" AS "author__id", "t_author"."name" AS "author__name" '
+        'FROM "posts" AS "t" LEFT JOIN "authors" AS "t_author" ON "t_author"."id" = "t"."author_id" '
+        'WHERE "t"."title" = $1 ORDER BY "t"."id" DESC;'
+    )
+
+
+def test_lookups_compile_to_plan_stable_sql():
+    where, values = PostgresEngine._filter_params({
+        'id__in': (1, 2, 3), 'id__gte': 2, 'title__startswith': '50%_off', 'title__isnull': False,
+    })
+    assert where == ('id__in', 'id__gte', 'title__startswith', 'title__isnotnull')
+    assert values == [[1, 2, 3], 2, '50\\%\\_off%']
+
+    sql = PostgresEngine._build_select_sql('books', where, [], True)
+    assert sql == (
+        'SELECT * FROM "books" WHERE "id" = ANY($1) AND "id" >= $2 AND "title" LIKE $3 '
+        'AND "title" IS NOT NULL LIMIT $4;'
+    )
+    # The statement shape does not depend on how many values `__in` gets.
+    assert PostgresEngine._filter_params({'id__in': [1]})[0] == PostgresEngine._filter_params({'id__in': [1, 2]})[0]
+
+
+def test_count_and_exists_sql_never_fetch_rows():
+    assert PostgresEngine._build_count_sql('books', ('title', 'id__gt')) == \
+        'SELECT count(*) AS "count" FROM "books" WHERE "title" = $1 AND "id" > $2;'
+    assert PostgresEngine._build_exists_sql('books', ()) == 'SELECT 1 AS "exists" FROM "books" LIMIT 1;'
+
+
+def test_aggregates_are_grouped_by_the_selected_columns():
+    annotations = (('n', 'COUNT', '*', False), ('total', 'SUM', 'price', False), ('k', 'COUNT', 'sku', True))
+    sql = PostgresEngine._build_select_sql('products', ('price__gt',), ['-n'], False, ('name',), annotations=annotations)
+    assert sql == (
+        'SELECT "name", COUNT(*) AS "n", SUM("price") AS "total", COUNT(DISTINCT "sku") AS "k" '
+        'FROM "products" WHERE "price" > $1 GROUP BY "name" ORDER BY "n" DESC;'
+    )
+    sql = PostgresEngine._build_select_sql('products', (), [], False, (), annotations=annotations[:1])
+    assert sql == 'SELECT COUNT(*) AS "n" FROM "products";'
+
+
+def test_set_based_update_and_delete_sql():
+    assert PostgresEngine._build_update_where_sql('books', ('title',), ('id__in',)) == (
+        'WITH "affected" AS (UPDATE "books" SET "title" = $1 WHERE "id" = ANY($2) RETURNING 1) '
+        'SELECT count(*) AS "count" FROM "affected";'
+    )
+    assert PostgresEngine._build_delete_where_sql('books', ('title__isnull',), ('id', 'title')) == \
+        'DELETE FROM "books" WHERE "title" IS NULL RETURNING "id", "title";'
+
+
+def test_keyset_pagination_sql():
+    sql = PostgresEngine._build_select_sql('books', ('title',), ['-year', '-id'], True, has_seek=True)
+    assert sql == (
+        'SELECT * FROM "books" WHERE "title" = $1 AND ("year", "id") < ($2, $3) '
+        'ORDER BY "year" DESC, "id" DESC LIMIT $4;'
+    )
+    seek_sql, next_param = PostgresEngine._build_seek_sql(['title', '-id'])
+    assert seek_sql == '(("title" > $1) OR ("title" = $1 AND "id" < $2))'
+    assert next_param == 3
+
+
+def test_select_in_sql_uses_one_array_parameter():
+    sql = PostgresEngine._build_select_in_sql('posts', 'author_id', 'id')
+    assert sql == 'SELECT * FROM "posts" WHERE "author_id" = ANY($1) ORDER BY "id" ASC;'
+
+
+def test_insert_sql_for_multiple_rows():
+    sql = PostgresEngine._build_insert_sql('books', ['title', 'year'], 2, returning='id')
+    assert sql == 'INSERT INTO "books" ("title", "year") VALUES ($1, $2), ($3, $4) RETURNING "id";'
+
+
+def test_compiled_statements_are_cached_per_shape():
+    engine = make_engine()
+    builds = []
+
+    def build(shape):
+        builds.append(shape)
+        return f"SQL for {shape}"
+
+    assert engine._statement(Book, ('select', 'a'), build, 'a') == "SQL for a"
+    assert engine._statement(Book, ('select', 'a'), build, 'a') == "SQL for a"
+    assert engine._statement(Book, ('select', 'b'), build, 'b') == "SQL for b"
+
+    assert builds == ['a', 'b']
+    stats = engine.statement_cache_stats()
+    assert stats['models']['books']['hits'] == 1
+    assert stats['total']['misses'] == 2
+
+
+def test_statement_cache_is_bounded():
+    engine = make_engine(statement_cache_size=2)
+    for shape in range(5):
+        engine._statement(Book, ('select', shape), str, shape)
+
+    stats = engine.statement_cache_stats()['models']['books']
+    assert stats['size'] == 2
+    assert stats['evictions'] == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_selects_are_invalidated_by_writes_to_the_table():
+    engine = make_engine()
+    executed = []
+
+    async def fake_execute(sql, values):
+        executed.append(sql)
+        return [{'count': 1}] if sql.startswith('WITH') else [{'id': 1, 'title': 'x'}]
+
+    engine._execute = fake_execute
+
+    for _ in range(2):
+        assert await engine.select(Book, filters={'id': 1}, cache_ttl=60) == [{'id': 1, 'title': 'x'}]
+    assert len(executed) == 1
+
+    await engine.update_where(Book, {'id': 1}, {'title': 'y'})
+    await engine.select(Book, filters={'id': 1}, cache_ttl=60)
+    assert len(executed) == 3
+
+    stats = engine.result_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (1, 2, 1)
+
+
+class Publisher(Model):
+    __tablename__ = 'publishers'
+    id = IntegerField(primary_key=True)
+    name = TextField()
+
+
+class Edition(Model):
+    __tablename__ = 'editions'
+    id = IntegerField(primary_key=True)
+    publisher = ForeignKey(to=Publisher)
+
+
+@pytest.mark.asyncio
+async def test_join_plan_is_computed_once_per_related_tuple(monkeypatch):
+    engine = make_engine()
+    calls = []
+    select_joins = PostgresEngine._select_joins
+
+    def counting_select_joins(model_class, related):
+        calls.append(related)
+        return select_joins(model_class, related)
+
+    monkeypatch.setattr(PostgresEngine, '_select_joins', staticmethod(counting_select_joins))
+
+    async def fake_execute(sql, values):
+        return [{'id': 1, 'publisher_id': 1, 'publisher__id': 1, 'publisher__name': 'x'}]
+
+    engine._execute = fake_execute
+
+    for _ in range(3):
+        await engine.select(Edition, filters={'id': 1}, related=('publisher',), cache_ttl=60)
+    assert calls == [('publisher',)]
+    assert engine._join_plan(Edition, ('publisher',))[1] == ('editions', 'publishers')
+    # Join plans stay out of the compiled SQL cache and its counters.
+    stats = engine.statement_cache_stats()['models']['editions']
+    assert (stats['size'], stats['hits'], stats['misses']) == (1, 2, 1)
+
+
+class RecordingConnection:
+    """A driver stand-in that records every statement, on every connection."""
+    log = []
+
+    def __init__(self, config):
+        pass
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def execute(self, sql, values):
+        RecordingConnection.log.append((id(self), sql))
+        return [{'count': 1}]
+
+
+def make_recording_engine():
+    RecordingConnection.log = []
+    engine = make_engine()
+    engine.pool = ConnectionPool({}, RecordingConnection, min_size=0, max_size=2, max_idle_time=None)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_atomic_pins_one_connection_and_uses_savepoints():
+    engine = make_recording_engine()
+    await engine.connect()
+
+    async with engine.atomic():
+        await engine.update_where(Book, {'id': 1}, {'title': 'a'})
+        with pytest.raises(RuntimeError):
+            async with engine.atomic():
+                await engine.delete_where(Book, {'id': 2})
+                raise RuntimeError("undo the inner block only")
+        async with engine.atomic():
+            await engine.count(Book)
+
+    statements = [sql for _, sql in RecordingConnection.log]
+    assert statements[0] == 'BEGIN;'
+    assert statements[2:5] == ['SAVEPOINT "swiftorm_sp_1";', statements[3], 'ROLLBACK TO SAVEPOINT "swiftorm_sp_1";']
+    assert statements[5] == 'RELEASE SAVEPOINT "swiftorm_sp_1";'
+    assert statements[6] == 'SAVEPOINT "swiftorm_sp_1";'
+    assert statements[-2:] == ['RELEASE SAVEPOINT "swiftorm_sp_1";', 'COMMIT;']
+    assert len({conn for conn, _ in RecordingConnection.log}) == 1
+    assert engine.pool.stats()['in_use'] == 0
+    await engine.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_atomic_rolls_back_on_error_and_bypasses_the_result_cache():
+    engine = make_recording_engine()
+    await engine.connect()
+
+    with pytest.raises(ValueError):
+        async with engine.atomic():
+            await engine.select(Book, cache_ttl=60)
+            raise ValueError("boom")
+
+    assert [sql for _, sql in RecordingConnection.log][-1] == 'ROLLBACK;'
+    assert engine.result_cache_stats()['size'] == 0
+    assert engine._current_transaction() is None
+    await engine.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_iterate_keeps_its_cursor_off_the_task_connection():
+    engine = make_recording_engine()
+    await engine.connect()
+
+    chunks = engine.iterate(Book, chunk_size=1)
+    async for rows in chunks:
+        assert engine.pool.current_connection() is None
+        await engine.update_where(Book, {'id': 1}, {'title': 'a'})
+        break
+    await chunks.aclose()
+
+    connections = {sql.split()[0]: conn for conn, sql in RecordingConnection.log}
+    # The write ran outside the cursor's transaction, which was rolled back alone.
+    assert connections['WITH'] != connections['DECLARE'] == connections['ROLLBACK;']
+    assert [sql for _, sql in RecordingConnection.log].count('ROLLBACK;') == 1
+    assert engine.pool.stats()['in_use'] == 0
+    await engine.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_iterate_shares_the_only_connection_of_a_single_connection_pool():
+    engine = make_recording_engine()
+    engine.pool.max_size = 1
+    engine.pool.acquire_timeout = 1.0
+    await engine.connect()
+
+    chunks = engine.iterate(Book, chunk_size=1)
+    async for rows in chunks:
+        # Would wait for a second connection until the acquire timeout.
+        await engine.update_where(Book, {'id': 1}, {'title': 'a'})
+        break
+    await chunks.aclose()
+
+    statements = [sql for _, sql in RecordingConnection.log]
+    # The write is kept: the shared transaction is committed, not rolled back.
+    assert statements[-1] == 'COMMIT;'
+    assert len({conn for conn, _ in RecordingConnection.log}) == 1
+    assert engine.pool.stats()['in_use'] == 0
+    await engine.disconnect()
+
+
+class FailingConnection(RecordingConnection):
+    """Fails every statement whose only value is 'fail'."""
+    async def execute(self, sql, values):
+        if values == ['fail']:
+            raise QueryError('invalid input syntax')
+        return await super().execute(sql, values)
+
+
+class PipeliningConnection(FailingConnection):
+    """Also exposes the pipeline hook; records each batch it receives."""
+    batches = []
+
+    async def execute_pipeline(self, statements):
+        PipeliningConnection.batches.append([sql for sql, _ in statements])
+        results = []
+        for sql, values in statements:
+            try:
+                results.append(await self.execute(sql, values))
+            except QueryError as e:
+                results.append(e)
+        return results
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_concurrent_queries_as_one_batch():
+    engine = make_recording_engine()
+    engine.pool.driver_class = PipeliningConnection
+    PipeliningConnection.batches = []
+    await engine.connect()
+
+    async with engine.pipeline() as pipeline:
+        results = await asyncio.gather(
+            *(engine.select(Book, filters={'id': i}) for i in range(5)),
+            engine.select(Book, filters={'title': 'fail'}),
+            return_exceptions=True,
+        )
+
+    assert results[:5] == [[{'count': 1}]] * 5
+    assert isinstance(results[5], QueryError)
+    assert len(PipeliningConnection.batches) == 1 and len(PipeliningConnection.batches[0]) == 6
+    assert len({conn for conn, _ in RecordingConnection.log}) == 1
+    assert pipeline.stats() == {'batches': 1, 'statements': 6}
+    await engine.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_execute_many_isolates_errors_without_the_pipeline_hook():
+    engine = make_recording_engine()
+    engine.pool.driver_class = FailingConnection
+    await engine.connect()
+
+    statements = [('SELECT 1;', []), ('SELECT $1::int;', ['fail']), ('SELECT 2;', [])]
+    # Spread over the pool's connections...
+    results = await engine.execute_many(statements, return_exceptions=True)
+    assert results[0] == results[2] == [{'count': 1}]
+    assert isinstance(results[1], QueryError)
+    assert len({conn for conn, _ in RecordingConnection.log}) == 2
+
+    # ...or run in order on the connection pinned by a transaction.
+    RecordingConnection.log = []
+    async with engine.atomic() as conn:
+        results = await engine.execute_many(statements, return_exceptions=True)
+        with pytest.raises(QueryError):
+            await engine.execute_many(statements)
+    assert isinstance(results[1], QueryError)
+    assert {conn_id for conn_id, _ in RecordingConnection.log} == {id(conn)}
+    await engine.disconnect()
+
+
+class InsertingConnection(FailingConnection):
+    """Returns a generated primary key for every inserted row."""
+    async def execute(self, sql, values):
+        rows = await super().execute(sql, values)
+        if sql.startswith('INSERT'):
+            return [{'id': len(RecordingConnection.log)} for _ in values]
+        return rows
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_is_all_or_nothing():
+    engine = make_recording_engine()
+    engine.pool.driver_class = InsertingConnection
+    await engine.connect()
+
+    books = [Book(title='a'), Book(title='fail')]
+    with pytest.raises(QueryError):
+        await engine.bulk_insert(Book, books, batch_size=1)
+
+    statements = [sql for _, sql in RecordingConnection.log]
+    assert statements[0] == 'BEGIN;' and statements[-1] == 'ROLLBACK;'
+    # The key of the first batch was rolled back too.
+    assert [book.id for book in books] == [None, None]
+
+    # Inside atomic(), the batches get a savepoint of their own.
+    RecordingConnection.log = []
+    async with engine.atomic():
+        await engine.bulk_insert(Book, [Book(title='b')])
+    statements = [sql for _, sql in RecordingConnection.log]
+    assert statements[1] == 'SAVEPOINT "swiftorm_sp_1";'
+    assert statements[-2:] == ['RELEASE SAVEPOINT "swiftorm_sp_1";', 'COMMIT;']
+    await engine.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_copy_fallback_is_all_or_nothing(monkeypatch):
+    engine = make_recording_engine()
+    engine.pool.driver_class = FailingConnection
+    await engine.connect()
+
+    with pytest.raises(ValueError):
+        await engine.copy_records(Book, [], format='csv')
+
+    # One row per INSERT batch, so the middle batch fails.
+    monkeypatch.setattr(postgresql, 'MAX_QUERY_PARAMETERS', 1)
+    records = [{'title': 'a'}, {'title': 'fail'}, {'title': 'c'}]
+    with pytest.raises(QueryError):
+        await engine.copy_records(Book, records)
+
+    # The first batch is rolled back with the failed one; the last is never sent.
+    statements = [sql for _, sql in RecordingConnection.log]
+    assert statements == ['BEGIN;', statements[1], 'ROLLBACK;']
+    assert statements[1].startswith('INSERT INTO "books"')
+    await engine.disconnect()
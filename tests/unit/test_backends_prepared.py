@@ -0,0 +1,80 @@
+import pytest
+from async_driver.exceptions import QueryError
+from swiftorm.backends.prepared import PreparedStatementCache, supports_prepared_statements
+
+
+class FakePreparingConnection:
+    """Records the protocol steps a driver with named-statement support would perform."""
+    def __init__(self):
+        self.steps = []
+        self.fail_next_execute = None
+
+    async def execute(self, sql, values):
+        self.steps.append(('execute', sql))
+        return []
+
+    async def prepare(self, name, sql):
+        self.steps.append(('parse', name))
+
+    async def execute_prepared(self, name, values):
+        if self.fail_next_execute:
+            error, self.fail_next_execute = self.fail_next_execute, None
+            raise error
+        self.steps.append(('bind', name))
+        return [{'values': values}]
+
+    async def close_statement(self, name):
+        self.steps.append(('close', name))
+
+
+def test_supports_prepared_statements_checks_driver_hooks():
+    assert supports_prepared_statements(FakePreparingConnection())
+    assert not supports_prepared_statements(object())
+
+
+@pytest.mark.asyncio
+async def test_repeated_sql_is_parsed_only_once():
+    conn = FakePreparingConnection()
+    cache = PreparedStatementCache(conn)
+
+    await cache.execute('SELECT $1;', [1])
+    await cache.execute('SELECT $1;', [2])
+
+    assert conn.steps == [('parse', 'swiftorm_stmt_1'), ('bind', 'swiftorm_stmt_1'), ('bind', 'swiftorm_stmt_1')]
+    assert cache.stats()['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_evicted_statements_are_closed_on_the_server():
+    conn = FakePreparingConnection()
+    cache = PreparedStatementCache(conn, maxsize=1)
+
+    await cache.execute('SELECT 1;', [])
+    await cache.execute('SELECT 2;', [])
+
+    assert ('close', 'swiftorm_stmt_1') in conn.steps
+    assert cache.stats()['size'] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_plan_is_reprepared_once():
+    conn = FakePreparingConnection()
+    cache = PreparedStatementCache(conn)
+    await cache.execute('SELECT * FROM "books";', [])
+
+    conn.fail_next_execute = QueryError('cached plan must not change result type')
+    result = await cache.execute('SELECT * FROM "books";', [])
+
+    assert result == [{'values': []}]
+    assert conn.steps[-3:] == [('close', 'swiftorm_stmt_1'), ('parse', 'swiftorm_stmt_2'), ('bind', 'swiftorm_stmt_2')]
+    assert cache.stats()['invalidations'] == 1
+
+
+@pytest.mark.asyncio
+async def test_other_query_errors_are_not_retried():
+    conn = FakePreparingConnection()
+    cache = PreparedStatementCache(conn)
+
+    conn.fail_next_execute = QueryError('duplicate key value violates unique constraint')
+    with pytest.raises(QueryError):
+        await cache.execute('INSERT INTO "books" ("id") VALUES ($1);', [1])
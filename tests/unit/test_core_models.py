@@ -1,5 +1,6 @@
+import dataclasses
 import pytest
-from swiftorm.core.models import Model
+from swiftorm.core.models import Model, _model_registry
 from swiftorm.core.fields import IntegerField, TextField, ForeignKey
 
 
@@ -111,3 +112,169 @@ def test_model_repr():
     assert repr(user) == "<User: id=1, username=behzad>"
     # Note: `author_id` is shown because of our improved __repr__
     assert repr(post) == "<Post: id=10, author_id=1, title=A Title>"
+
+
+def test_dirty_columns_tracking():
+    """
+    Tests that only columns changed since the last snapshot are reported as dirty.
+    """
+    # Without a snapshot, every non-PK column counts as changed.
+    post = Post(id=1, title='Draft', author_id=1)
+    assert post._get_dirty_columns() == ['title', 'author_id']
+
+    # After being marked as persisted, nothing is dirty.
+    post._mark_persisted()
+    assert post._is_new is False
+    assert post._get_dirty_columns() == []
+
+    post.title = 'Published'
+    assert post._get_dirty_columns() == ['title']
+
+    # Setting a value back to the original makes the column clean again.
+    post.title = 'Draft'
+    post.author_id = 2
+    assert post._get_dirty_columns() == ['author_id']
+
+
+def test_from_db_row_builds_a_persisted_instance():
+    """
+    Tests that rows are hydrated without __init__ and are marked as persisted.
+    """
+    post = Post._from_db_row({'id': 3, 'title': 'Loaded', 'author_id': 1})
+
+    assert isinstance(post, Post)
+    assert (post.id, post.title, post.author_id) == (3, 'Loaded', 1)
+    assert post._is_new is False
+    assert post._original_pk_value == 3
+    assert post._get_dirty_columns() == []
+    assert repr(post) == "<Post: id=3, author_id=1, title=Loaded>"
+
+
+def test_model_metadata_is_precomputed():
+    """
+    Tests that the metaclass computes the column layout once per model.
+    """
+    meta = Post._meta
+    assert meta.table_name == 'post'
+    assert meta.columns == ('id', 'title', 'author_id')
+    assert meta.pk_name == 'id'
+    assert meta.auto_pk is True
+    assert meta.fk_columns == {'author': 'author_id'}
+    assert meta.quoted_columns['author_id'] == '"author_id"'
+    assert meta.column_for('author') == meta.column_for('author_id') == 'author_id'
+    assert meta.column_for('missing') is None
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        meta.pk_name = 'title'
+
+
+def test_fields_are_inherited_from_abstract_models():
+    """
+    Tests that an abstract base model contributes its fields to subclasses
+    without needing a primary key or a table of its own.
+    """
+    class Timestamped(Model):
+        __abstract__ = True
+        created_at = TextField()
+        owner = ForeignKey(to=User)
+
+    class Note(Timestamped):
+        id = IntegerField(primary_key=True)
+        body = TextField()
+
+    assert not hasattr(Timestamped, 'objects')
+    assert Note._meta.columns == ('created_at', 'id', 'body', 'owner_id')
+    note = Note(id=1, body='text', created_at='today', owner_id=5)
+    assert note.created_at == 'today'
+    assert note.owner_id == 5
+
+
+def test_compact_models_store_columns_in_slots():
+    """
+    Tests that `__compact__ = True` models have no per-instance `__dict__`
+    and still support loading, dirty tracking and unknown-attribute errors.
+    """
+    class Tag(Model):
+        __compact__ = True
+        id = IntegerField(primary_key=True)
+        label = TextField()
+        owner = ForeignKey(to=User)
+
+    tag = Tag._from_db_row({'id': 1, 'label': 'python', 'owner_id': 2})
+    assert not hasattr(tag, '__dict__')
+    assert not hasattr(tag, '__weakref__')
+    assert (tag.id, tag.label, tag.owner_id) == (1, 'python', 2)
+    assert tag._is_new is False
+    assert tag._get_dirty_columns() == []
+
+    tag.label = 'rust'
+    assert tag._get_dirty_columns() == ['label']
+    tag._mark_persisted()
+    assert tag._get_dirty_columns() == []
+
+    # Columns left out of the row (see `only()`) stay unloaded.
+    partial = Tag._from_db_row({'id': 2})
+    assert not hasattr(partial, 'label')
+    assert partial._get_dirty_columns() == []
+
+    with pytest.raises(AttributeError):
+        tag.nickname = 'py'
+    with pytest.raises(AttributeError):
+        Tag(id=3, nickname='py')
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_unloaded_columns_become_dirty_once_assigned(compact):
+    """
+    Tests that assigning None to a column a partial load left out counts as
+    a change, whether the model stores its columns in `__dict__` or slots.
+    """
+    class Note(Model):
+        __compact__ = compact
+        id = IntegerField(primary_key=True)
+        text = TextField()
+
+    partial = Note._from_db_row({'id': 1})
+    assert partial._get_dirty_columns() == []
+    partial.text = None
+    assert partial._get_dirty_columns() == ['text']
+
+    # The same holds after a later snapshot, e.g. once the instance was saved.
+    other = Note._from_db_row({'id': 2})
+    other._take_snapshot()
+    other.text = None
+    assert other._get_dirty_columns() == ['text']
+
+
+def test_foreign_keys_register_reverse_relations_on_their_targets():
+    """
+    Tests that `ForeignKey(to=User)` on Post registers `User.post_set`,
+    which only holds a value once it has been prefetched.
+    """
+    relation = User._reverse_relations['post_set']
+    assert User.post_set is relation
+    assert (relation.model_class, relation.fk_name, relation.column) == (Post, 'author', 'author_id')
+
+    user = User._from_db_row({'id': 1, 'username': 'behzad'})
+    with pytest.raises(AttributeError, match="prefetch_related"):
+        user.post_set
+    user._prefetched = {'post_set': []}
+    assert user.post_set == []
+
+    # Several ForeignKeys to the same target get one accessor each.
+    class Message(Model):
+        id = IntegerField(primary_key=True)
+        sender = ForeignKey(to=User)
+        recipient = ForeignKey(to=User)
+
+    assert User.message_sender_set.column == 'sender_id'
+    assert User.message_recipient_set.column == 'recipient_id'
+    assert 'message_set' not in User._reverse_relations
+
+    # An invalid model is rejected before it is registered anywhere.
+    with pytest.raises(TypeError, match="primary key"):
+        class Draft(Model):
+            title = TextField()
+            author = ForeignKey(to=User)
+    assert 'draft_set' not in User._reverse_relations
+    assert all(model.__name__ != 'Draft' for model in _model_registry)
@@ -0,0 +1,233 @@
+import base64
+
+import pytest
+from swiftorm import db
+from swiftorm.core import exceptions
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField, ForeignKey
+from swiftorm.core.aggregates import Count, Max
+from swiftorm.core.query import _encode_cursor, _decode_cursor
+
+
+class Article(Model):
+    id = IntegerField(primary_key=True)
+    title = TextField()
+    status = TextField()
+
+
+class Comment(Model):
+    id = IntegerField(primary_key=True)
+    body = TextField()
+    article = ForeignKey(to=Article)
+
+
+def test_chaining_does_not_modify_the_original_queryset():
+    base = Article.objects.filter(status='draft')
+    narrowed = base.filter(title='Hello').order_by('-id')
+
+    assert base._filters == {'status': 'draft'}
+    assert base._ordering == []
+    assert narrowed._filters == {'status': 'draft', 'title': 'Hello'}
+    assert narrowed._ordering == ['-id']
+    assert Article.objects._filters == {}
+
+
+def test_later_filters_override_earlier_ones_and_orderings_accumulate():
+    qs = Article.objects.filter(status='draft').order_by('title').filter(status='live').order_by('-id')
+
+    assert qs._filters == {'status': 'live'}
+    assert qs._ordering == ['title', '-id']
+
+
+def test_clones_share_state_instead_of_copying_it():
+    big_value = list(range(10000))
+    base = Article.objects.filter(id=big_value)
+    child = base.order_by('id')
+
+    # The filter chain (and the value inside it) is shared, not deep-copied.
+    assert child._filter_node is base._filter_node
+    assert child._filters['id'] is big_value
+
+
+def test_projection_column_names_are_resolved_and_validated():
+    assert Article.objects.only('title')._columns == ('id', 'title')
+    assert Article.objects.values('status', 'id')._columns == ('status', 'id')
+    assert Article.objects.values()._columns == ('id', 'title', 'status')
+
+    with pytest.raises(AttributeError, match="has no attribute 'secret'"):
+        Article.objects.values('secret')
+
+    with pytest.raises(TypeError):
+        Article.objects.values_list('id', 'title', flat=True)
+
+
+def test_projections_hydrate_rows_without_model_init():
+    rows = [{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}]
+
+    assert Article.objects.values('id', 'title')._hydrate(rows) == rows
+    assert Article.objects.values_list('id', 'title')._hydrate(rows) == [(1, 'A'), (2, 'B')]
+    assert Article.objects.values_list('title', flat=True)._hydrate(rows) == ['A', 'B']
+
+    partial = Article.objects.only('title')._hydrate(rows)[0]
+    assert isinstance(partial, Article)
+    assert partial._is_new is False
+    assert (partial.id, partial.title) == (1, 'A')
+    # 'status' was never loaded, so it is neither validated nor written.
+    assert not hasattr(partial, 'status')
+    partial.validate()
+    assert partial._get_dirty_columns() == []
+    partial.title = 'Changed'
+    assert partial._get_dirty_columns() == ['title']
+
+
+def test_select_related_attaches_one_instance_per_related_row():
+    rows = [
+        {'id': 1, 'body': 'a', 'article_id': 7, 'article__id': 7, 'article__title': 'T', 'article__status': 'live'},
+        {'id': 2, 'body': 'b', 'article_id': 7, 'article__id': 7, 'article__title': 'T', 'article__status': 'live'},
+        {'id': 3, 'body': 'c', 'article_id': None, 'article__id': None, 'article__title': None, 'article__status': None},
+    ]
+    first, second, orphan = Comment.objects.select_related('article')._hydrate(rows)
+
+    assert isinstance(first.article, Article)
+    assert (first.article.id, first.article.title) == (7, 'T')
+    assert first.article._is_new is False
+    # Rows pointing at the same target share one instance.
+    assert second.article is first.article
+    assert orphan.article is None
+    # The joined columns are not part of the comment's own snapshot.
+    assert first._get_dirty_columns() == []
+    assert set(first._original_values) == {'id', 'body', 'article_id'}
+
+    with pytest.raises(ValueError):
+        Comment.objects.select_related('body')
+    with pytest.raises(AttributeError):
+        Comment.objects.select_related('missing')
+
+
+def test_filter_lookups_are_normalized_and_validated():
+    qs = Comment.objects.filter(article=1, id__exact=2, id__in=[1, 2], body__startswith='x')
+    assert qs._filters == {'article_id': 1, 'id': 2, 'id__in': [1, 2], 'body__startswith': 'x'}
+    qs.validate_filters()
+
+    for bad in ({'id__in': '12'}, {'id__in': [1, 'a']}, {'id__gt': 'a'},
+                {'body__isnull': 'yes'}, {'id__startswith': '1'}):
+        with pytest.raises(exceptions.ValidationError):
+            Comment.objects.filter(**bad).validate_filters()
+
+    with pytest.raises(AttributeError):
+        Comment.objects.filter(body__contains='x').validate_filters()
+
+
+def test_annotate_resolves_aggregates_and_requires_values():
+    qs = Comment.objects.values('article').annotate(n=Count(), last=Max('id'))
+    assert qs._columns == ('article_id',)
+    assert qs._annotations == (('n', 'COUNT', '*', False), ('last', 'MAX', 'id', False))
+    rows = [{'article_id': 7, 'n': 2, 'last': 9}]
+    assert Comment.objects.values_list('article').annotate(n=Count())._hydrate(rows) == [(7, 2)]
+
+    with pytest.raises(TypeError):
+        Comment.objects.annotate(n=Count())
+    with pytest.raises(TypeError):
+        Comment.objects.values('id').annotate(n='id')
+    with pytest.raises(ValueError):
+        Comment.objects.values('id').annotate(body=Count())
+    with pytest.raises(AttributeError):
+        Comment.objects.values('id').annotate(n=Count('missing'))
+
+
+def test_keyset_ordering_and_cursors():
+    assert Comment.objects.order_by('-article', 'body')._keyset_ordering() == ['-article_id', 'body', 'id']
+    assert Comment.objects.order_by('-id')._keyset_ordering() == ['-id']
+    assert Comment.objects._keyset_ordering() == ['id']
+
+    cursor = _encode_cursor(['body', 'id'], ['x y', 7])
+    assert _decode_cursor(cursor, ['body', 'id']) == ['x y', 7]
+    with pytest.raises(ValueError):
+        _decode_cursor(cursor, ['id'])
+    with pytest.raises(ValueError):
+        _decode_cursor('not a cursor!', ['id'])
+
+    # Well-formed JSON of the wrong shape is just as invalid.
+    for payload in (b'[["id"], 5]', b'["id", [5]]', b'[1, 2, 3]', b'{"a": 1}'):
+        tampered = base64.urlsafe_b64encode(payload).decode('ascii')
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            _decode_cursor(tampered, ['id'])
+
+
+class FakeWriteEngine:
+    """Records the columns written by bulk_update() and update()."""
+    def __init__(self):
+        self.writes = []
+
+    async def bulk_update(self, model_class, instances, fields, batch_size=None):
+        self.writes.append(('bulk_update', tuple(fields)))
+        return len(instances)
+
+    async def update(self, model_instance, columns=None):
+        self.writes.append(('update', tuple(columns)))
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_keeps_other_changes_dirty(monkeypatch):
+    engine = FakeWriteEngine()
+    monkeypatch.setattr(db, 'engine', engine)
+    article = Article._from_db_row({'id': 1, 'title': 'Old', 'status': 'draft'})
+
+    article.title = 'New'
+    article.status = 'live'
+    await Article.objects.bulk_update([article], fields=['title'])
+    assert article._get_dirty_columns() == ['status']
+
+    await article.save()
+    assert engine.writes == [('bulk_update', ('title',)), ('update', ('status',))]
+
+
+class FakeReadEngine:
+    """Returns one comment for every SELECT and records the filters it got."""
+    def __init__(self):
+        self.filters = []
+
+    async def select(self, model_class, filters={}, **kwargs):
+        self.filters.append(filters)
+        return [{'id': 1, 'body': 'x', 'article_id': 1}]
+
+
+@pytest.mark.asyncio
+async def test_get_validates_its_lookups_before_querying(monkeypatch):
+    engine = FakeReadEngine()
+    monkeypatch.setattr(db, 'engine', engine)
+
+    for bad in ({'body__startswith': 5}, {'body__isnull': 'no'}, {'id__in': [1, 'a']}):
+        with pytest.raises(exceptions.ValidationError):
+            await Comment.objects.get(**bad)
+    with pytest.raises(AttributeError):
+        await Comment.objects.get(nickname='x')
+    assert engine.filters == []
+
+    # One-shot iterables are read once, not used up by validation.
+    await Comment.objects.get(id__in=(i for i in [1, 2]))
+    assert engine.filters == [{'id__in': (1, 2)}]
+
+    qs = Comment.objects.filter(id__in=(i for i in [1, 2]))
+    qs.validate_filters()
+    assert qs.order_by('id')._filters == {'id__in': (1, 2)}
+
+
+@pytest.mark.asyncio
+async def test_get_returns_the_projection_like_first(monkeypatch):
+    engine = FakeReadEngine()
+    selects = []
+
+    async def select(model_class, filters={}, columns=None, **kwargs):
+        selects.append(columns)
+        return [{'id': 1, 'body': 'x', 'article_id': 1}]
+
+    engine.select = select
+    monkeypatch.setattr(db, 'engine', engine)
+
+    assert await Comment.objects.values('body').get(id=1) == {'id': 1, 'body': 'x', 'article_id': 1}
+    assert await Comment.objects.values_list('id', 'body').get(id=1) == (1, 'x')
+    assert await Comment.objects.values_list('body', flat=True).get(id=1) == 'x'
+    partial = await Comment.objects.only('body').get(id=1)
+    assert isinstance(partial, Comment)
+    assert selects == [('body',), ('id', 'body'), ('body',), ('id', 'body')]
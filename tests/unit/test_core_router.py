@@ -0,0 +1,115 @@
+import sys
+import types
+
+import pytest
+import swiftorm
+from swiftorm import db
+from swiftorm.backends.postgresql import PostgresEngine
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField
+from swiftorm.core.router import Router
+
+
+def make_engine():
+    # The pool only opens connections on `connect()`, so no database is needed here.
+    return PostgresEngine({'user': 'u', 'password': 'p', 'database': 'd', 'host': 'h', 'port': 5432})
+
+
+class Ledger(Model):
+    __tablename__ = 'ledgers'
+    id = IntegerField(primary_key=True)
+    balance = TextField()
+
+
+def fake_database(engine, rows):
+    """Makes `engine` answer every query from `rows` and count them."""
+    executed = []
+
+    async def fake_execute(sql, values):
+        executed.append(sql)
+        return [{'count': 1}] if sql.startswith('WITH') else [dict(row) for row in rows]
+
+    engine._execute = fake_execute
+    return executed
+
+
+@pytest.mark.asyncio
+async def test_replica_results_never_leak_into_read_your_writes():
+    primary, replica = make_engine(), make_engine()
+    router = Router(primary, [replica], sticky_seconds=60)
+    primary.on_write = router.record_write
+    replica.alias, replica.result_cache, replica.replica_lag = 'replica', primary.result_cache, 60
+
+    primary_rows = [{'id': 1, 'balance': 'new'}]
+    fake_database(primary, primary_rows)
+    # The replica has not applied the write yet.
+    replica_queries = fake_database(replica, [{'id': 1, 'balance': 'old'}])
+
+    await primary.update_where(Ledger, {'id': 1}, {'balance': 'new'})
+    assert await replica.select(Ledger, filters={'id': 1}, cache_ttl=60) == [{'id': 1, 'balance': 'old'}]
+
+    # The writer's sticky read goes to the primary and gets its own write...
+    engine = router.db_for_read(Ledger)
+    assert engine is primary
+    assert await engine.select(Ledger, filters={'id': 1}, cache_ttl=60) == primary_rows
+
+    # ...and the stale replica row was not cached for the other readers.
+    await replica.select(Ledger, filters={'id': 1}, cache_ttl=60)
+    assert len(replica_queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_router_round_robins_reads_and_sticks_to_the_primary_after_a_write():
+    primary, replica_1, replica_2 = make_engine(), make_engine(), make_engine()
+    router = Router(primary, [replica_1, replica_2], sticky_seconds=60)
+
+    assert [router.db_for_read(None) for _ in range(3)] == [replica_1, replica_2, replica_1]
+
+    router.record_write()
+    assert router.db_for_read(None) is primary
+    assert router.stats() == {'replicas': 2, 'primary_reads': 0, 'replica_reads': 3, 'sticky_reads': 1}
+
+    # No window at all: reads go straight back to the replicas.
+    router.sticky_seconds = 0
+    assert router.db_for_read(None) is replica_2
+
+
+@pytest.mark.asyncio
+async def test_router_least_loaded_and_transactions():
+    primary, replica_1, replica_2 = make_engine(), make_engine(), make_engine()
+    router = Router(primary, [replica_1, replica_2], strategy='least_loaded')
+
+    replica_1.pool._in_use.add(object())
+    assert router.db_for_read(None) is replica_2
+
+    # Inside atomic() the task holds a primary connection: reads must see its writes.
+    primary.pool.current_connection = lambda: object()
+    assert router.db_for_read(None) is primary
+
+    with pytest.raises(ValueError):
+        Router(primary, [replica_1], strategy='random')
+
+
+def test_setup_builds_every_database_and_the_router(monkeypatch):
+    monkeypatch.setattr(db, 'engine', None)
+    monkeypatch.setattr(db, 'engines', {})
+    monkeypatch.setattr(db, 'router', None)
+
+    config = {'engine': 'swiftorm.backends.postgresql.PostgresEngine', 'user': 'u', 'database': 'd'}
+    settings = types.ModuleType('router_test_settings')
+    settings.DATABASES = {'default': config, 'replica': {**config, 'host': 'replica'}}
+    settings.DATABASE_ROUTER = {'replicas': ['replica'], 'sticky_seconds': 5.0}
+    monkeypatch.setitem(sys.modules, 'router_test_settings', settings)
+
+    swiftorm.setup('router_test_settings')
+
+    assert set(db.engines) == {'default', 'replica'}
+    assert db.router.primary is db.engine
+    assert db.router.replicas == [db.engines['replica']]
+    assert db.engine.on_write == db.router.record_write
+    assert db.engines['replica'].result_cache is db.engine.result_cache
+    assert (db.engines['replica'].alias, db.engines['replica'].replica_lag) == ('replica', 5.0)
+
+    settings.DATABASE_ROUTER = {'replicas': ['missing']}
+    with pytest.raises(ValueError):
+        swiftorm.setup('router_test_settings')
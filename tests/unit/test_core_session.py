@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+import swiftorm
+from swiftorm import db
+from swiftorm.core.models import Model
+from swiftorm.core.fields import IntegerField, TextField, ForeignKey
+from swiftorm.core.session import current_session
+
+
+class Shelf(Model):
+    id = IntegerField(primary_key=True)
+    name = TextField()
+
+
+class Volume(Model):
+    id = IntegerField(primary_key=True)
+    title = TextField()
+    shelf = ForeignKey(to=Shelf)
+
+
+class FakeEngine:
+    """Answers every SELECT with the same rows and counts the queries."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.selects = 0
+
+    async def select(self, model_class, **kwargs):
+        self.selects += 1
+        return [dict(row) for row in self.rows]
+
+    async def delete_where(self, model_class, filters, returning=None):
+        return len(self.rows)
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    engine = FakeEngine([{'id': 1, 'name': 'Fiction'}])
+    monkeypatch.setattr(db, 'engine', engine)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_session_returns_one_instance_per_row(fake_engine):
+    async with swiftorm.session() as session:
+        first = await Shelf.objects.get(id=1)
+        again = await Shelf.objects.all()
+        by_pk = await Shelf.objects.get(pk=1)
+
+        assert again[0] is first
+        assert by_pk is first
+        # The lookup by primary key was answered by the identity map.
+        assert fake_engine.selects == 2
+        assert len(session) == 1
+
+    assert current_session() is None
+    outside = await Shelf.objects.get(id=1)
+    assert outside is not first
+
+
+@pytest.mark.asyncio
+async def test_session_keeps_partial_instances_out(fake_engine):
+    async with swiftorm.session() as session:
+        partial = await Shelf.objects.only('id').first()
+        assert len(session) == 0
+        full = await Shelf.objects.first()
+        assert full is not partial
+        assert (await Shelf.objects.only('id').first()) is full
+
+
+@pytest.mark.asyncio
+async def test_session_forgets_rows_changed_by_set_based_writes(fake_engine):
+    async with swiftorm.session() as session:
+        await Shelf.objects.get(id=1)
+        session.add(Volume._from_db_row({'id': 5, 'title': 'T', 'shelf_id': 1}))
+        assert len(session) == 2
+
+        # Deleting shelves may cascade to their volumes.
+        await Shelf.objects.filter(id=1).delete()
+        assert len(session) == 0
+
+
+@pytest.mark.asyncio
+async def test_session_is_scoped_to_the_async_context(fake_engine):
+    async def load():
+        async with swiftorm.session():
+            return await Shelf.objects.get(id=1)
+
+    a, b = await asyncio.gather(load(), load())
+    assert a is not b
+
+    async with swiftorm.session() as outer:
+        async with swiftorm.session() as inner:
+            assert inner is outer